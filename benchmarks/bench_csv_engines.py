@@ -0,0 +1,93 @@
+"""
+Parsing a year index with the pandas and the pyarrow CSV engines.
+
+    PYTHONPATH=src python benchmarks/bench_csv_engines.py [-n 1000000 10000000]
+
+Indices are synthetic 10 s cadence start,stop,datakey,filesize rows
+(about 110 bytes each), parsed in memory, timestamps included, the way
+request_cloud_catalog does after the download.
+"""
+
+import argparse
+import os
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+import cloudcatalog
+
+
+def make_rows(first, n):
+    rows = np.arange(first, first + n)
+    times = np.datetime64("2019-01-01T00:00:00") + rows * np.timedelta64(10, "s")
+    start = pd.Series(np.datetime_as_string(times, unit="s")).astype(str) + "Z"
+    stop = pd.Series(
+        np.datetime_as_string(times + np.timedelta64(9, "s"), unit="s")
+    ).astype(str)
+    datakey = (
+        "s3://gov-nasa-hdrl-data1/mms/mms1/fpi/brst/l2/des-moms/mms1_fpi_brst_"
+        + pd.Series(rows).astype(str).str.zfill(9)
+        + "_v3.4.0.cdf"
+    )
+    return pd.DataFrame(
+        {
+            "start": start,
+            "stop": stop + "Z",
+            "datakey": datakey,
+            "filesize": rows % 500000 + 100000,
+        }
+    )
+
+
+def make_index(n, step=1_000_000):
+    # Written a million rows at a time to keep the peak memory down
+    buffer = BytesIO()
+    buffer.write(b"# ")
+    for first in range(0, n, step):
+        make_rows(first, min(step, n - first)).to_csv(
+            buffer, index=False, header=first == 0
+        )
+    return buffer.getvalue()
+
+
+def parser(engine):
+    # A CloudCatalog without a bucket, only its index parsing is used
+    catalog = cloudcatalog.CloudCatalog.__new__(cloudcatalog.CloudCatalog)
+    catalog._configure("benchmark", False, None, None, {}, engine=engine)
+    catalog.catalog = {"Cloudy": "1.0"}
+    return catalog
+
+
+def main():
+    parser_ = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser_.add_argument(
+        "-n", type=int, nargs="+", default=[1_000_000, 10_000_000], help="rows"
+    )
+    args = parser_.parse_args()
+
+    print(f"pandas {pd.__version__}, {os.cpu_count()} CPUs")
+    for n in args.n:
+        index = make_index(n)
+        print(f"{n} rows, {len(index) / 1024**2:.0f} MB")
+        expected = None
+        for engine in ("pandas", "pyarrow"):
+            catalog = parser(engine)
+            begin = time.perf_counter()
+            fr = catalog._parse_index_file(BytesIO(index))
+            took = time.perf_counter() - begin
+            print(f"  {engine:8s} {took:7.2f} s")
+            # Both results only fit in memory together for smaller indices
+            if expected is None:
+                expected = fr if n <= 2_000_000 else fr.dtypes
+            elif isinstance(expected, pd.DataFrame):
+                pd.testing.assert_frame_equal(fr, expected)
+            else:
+                pd.testing.assert_series_equal(fr.dtypes, expected)
+            del fr
+        del expected, index
+
+
+if __name__ == "__main__":
+    main()
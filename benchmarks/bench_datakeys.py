@@ -0,0 +1,74 @@
+"""
+Memory of the datakey column of a big listing: plain strings (object and
+the default str dtype) against compact_datakeys.
+
+    PYTHONPATH=src python benchmarks/bench_datakeys.py [-n 5000000] [--days 365]
+
+Keys look like an MMS burst listing, one folder per day holding n / days
+files: s3://gov-nasa-hdrl-data1/spdf/cdaweb/data/mms/mms1/feeps/brst/l2/
+electron/YYYY/MM/DD/mms1_feeps_brst_l2_electron_YYYYMMDDHHMMSS_v7.1.0.cdf
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import cloudcatalog
+
+FOLDER = "s3://gov-nasa-hdrl-data1/spdf/cdaweb/data/mms/mms1/feeps/brst/l2/electron/"
+
+
+def make_listing(n, days):
+    times = np.datetime64("2019-01-01T00:00:00") + (
+        np.arange(n) * (days * 86400 // n)
+    ).astype("timedelta64[s]")
+    stamps = pd.Series(np.datetime_as_string(times, unit="s")).astype(str)
+    digits = stamps.str.replace(r"[-T:]", "", regex=True)
+    folders = stamps.str.slice(0, 10).str.replace("-", "/")
+    datakey = (
+        FOLDER + folders + "/mms1_feeps_brst_l2_electron_" + digits + "_v7.1.0.cdf"
+    )
+    return pd.DataFrame(
+        {
+            "start": times,
+            "stop": times + np.timedelta64(9, "s"),
+            "datakey": datakey.astype(str),
+            "filesize": np.full(n, 150000, dtype="int64"),
+        }
+    )
+
+
+def megabytes(fr, columns):
+    return fr[columns].memory_usage(index=False, deep=True).sum() / 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=5_000_000, help="rows")
+    parser.add_argument("--days", type=int, default=365, help="folders")
+    args = parser.parse_args()
+
+    fr = make_listing(args.n, args.days)
+    print(f"{args.n} rows, {args.days} folders, pandas {pd.__version__}")
+    plain = fr.assign(datakey=fr["datakey"].astype(object))
+    print(f"datakey as object: {megabytes(plain, ['datakey']):9.1f} MB")
+    del plain
+    print(f"datakey as {fr['datakey'].dtype}:    {megabytes(fr, ['datakey']):9.1f} MB")
+
+    begin = time.perf_counter()
+    compact = cloudcatalog.compact_datakeys(fr)
+    took = time.perf_counter() - begin
+    columns = ["datakey_prefix", "datakey_suffix"]
+    print(f"compact datakeys:  {megabytes(compact, columns):9.1f} MB ({took:.2f} s)")
+
+    begin = time.perf_counter()
+    expanded = cloudcatalog.expand_datakeys(compact)
+    took = time.perf_counter() - begin
+    assert expanded["datakey"].equals(fr["datakey"])
+    print(f"expand_datakeys:   {took:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per-fetch client overhead: a fresh boto3 client per call (the old
+fetch_S3 behaviour) against the shared S3ClientRegistry.
+
+    PYTHONPATH=src python benchmarks/bench_s3_clients.py [-n 200] [--url s3://bucket/key]
+
+Without --url only client acquisition is timed, which needs no network.
+With --url each iteration also does a real GET of that object.
+"""
+
+import argparse
+import time
+
+import boto3
+from botocore import UNSIGNED
+from botocore.client import Config
+
+import cloudcatalog
+
+
+def fresh_client():
+    return boto3.client(
+        "s3", config=Config(signature_version=UNSIGNED), region_name="us-east-1"
+    )
+
+
+def pooled_client():
+    return cloudcatalog.s3_client_registry.get_client(unsigned=True, region="us-east-1")
+
+
+def timeit(get_client, n, url=None):
+    if url is not None:
+        bucket, key = cloudcatalog.s3url_to_bucketkey(url)
+    get_client()  # warm up botocore's loader caches for both cases
+    start = time.perf_counter()
+    for _ in range(n):
+        client = get_client()
+        if url is not None:
+            client.get_object(Bucket=bucket, Key=key)["Body"].read()
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=200, help="iterations")
+    parser.add_argument("--url", default=None, help="object to fetch each time")
+    args = parser.parse_args()
+
+    before = timeit(fresh_client, args.n, args.url)
+    after = timeit(pooled_client, args.n, args.url)
+    print(f"fresh client per fetch: {before * 1e3:8.3f} ms/fetch")
+    print(f"shared client registry: {after * 1e3:8.3f} ms/fetch")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Timestamp parsing of index frames: the old cascade of pd.to_datetime
+formats against the single-pass parse_iso8601.
+
+    PYTHONPATH=src python benchmarks/bench_timestamps.py [-n 10000000] [--mixed]
+
+Rows are 10 s cadence YYYY-MM-DDTHH:MM:SSZ strings. With --mixed, every
+tenth row has milliseconds, which the cascade cannot parse at all after
+trying every format in turn.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import cloudcatalog
+
+
+def make_column(n, mixed):
+    times = np.datetime64("2019-01-01T00:00:00") + np.arange(n) * np.timedelta64(
+        10, "s"
+    )
+    column = pd.Series(np.datetime_as_string(times, unit="s")).astype(object) + "Z"
+    if mixed:
+        column[::10] = (
+            pd.Series(np.datetime_as_string(times[::10], unit="ms"), dtype=object) + "Z"
+        )
+    return column.astype(str)
+
+
+def cascade(column):
+    # request_cloud_catalog before parse_iso8601
+    try:
+        return pd.to_datetime(column, format="%Y-%m-%dT%H:%M:%S.%fZ", exact=False)
+    except:
+        try:
+            return pd.to_datetime(column, format="%Y-%m-%dT%H:%M:%SZ", exact=False)
+        except:
+            return pd.to_datetime(column, format="%Y-%m-%dT%H:%MZ", exact=False)
+
+
+def timeit(parse, column):
+    start = time.perf_counter()
+    try:
+        parse(column)
+    except ValueError:
+        print(f"{parse.__name__} failed after {time.perf_counter() - start:.3f} s")
+        return None
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=10_000_000, help="rows")
+    parser.add_argument("--mixed", action="store_true", help="mix precisions")
+    args = parser.parse_args()
+
+    column = make_column(args.n, args.mixed)
+    before = timeit(cascade, column)
+    after = timeit(cloudcatalog.parse_iso8601, column)
+    print(f"{args.n} rows")
+    if before is not None:
+        print(f"to_datetime cascade: {before:8.3f} s")
+    print(f"parse_iso8601:       {after:8.3f} s")
+    if before is not None:
+        print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
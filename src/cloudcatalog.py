@@ -21,20 +21,42 @@ myfiles = fr.request_cloud_catalog(
           )
 """
 
+import asyncio
+import contextlib
+import csv
+import errno
+import functools
+import gzip
+import importlib
+import inspect
+import io
 from io import BytesIO
-from datetime import datetime
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
 from math import ceil
-from typing import List, Dict, Tuple, Union, Optional, Callable
+from typing import List, Dict, Tuple, Union, Optional, Callable, Iterable, Iterator
 import os
 import json
+import random
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import dateutil
 import re
+from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
+import numpy as np
 import pandas as pd
 import boto3
+import boto3.session
 from botocore import UNSIGNED
 from botocore.client import Config
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
 
 """
 To support other clouds, add code to fetch_S3 and s3url_to_https, and
@@ -73,129 +95,1720 @@ def s3url_to_bucketkey(s3url, bucket_prefix="s3://"):
     return mybucket, myfilekey
 
 
-def fetch_S3(s3url, unsigned=True, region=None, rawbytes=False, **client_kwargs):
+class S3ClientRegistry:
+    """
+    Thread-safe registry of reusable boto3 S3 clients.
+
+    Building a boto3 client resolves credentials and endpoints and opens a
+    new connection pool, which costs far more than a small GET. Clients are
+    therefore built once per (unsigned, region, pool size, client_kwargs)
+    combination and shared by fetch_S3, fetch_S3orURL and
+    CloudCatalog.stream.
+    """
+
+    def __init__(self, max_pool_connections: int = 10) -> None:
+        """
+        Parameters:
+            max_pool_connections (int): Default size of the urllib3
+                         connection pool of each client, i.e. how many
+                         requests one client can have in flight at once.
+        """
+        self.max_pool_connections = max_pool_connections
+        self._clients = {}
+        self._session = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        unsigned: bool,
+        region: Optional[str],
+        timeout: Optional[float],
+        max_pool_connections: int,
+        client_kwargs: Dict,
+    ) -> Tuple:
+        # Unhashable values (e.g. a botocore Config) are keyed by their repr
+        kwargs = tuple(sorted((key, repr(val)) for key, val in client_kwargs.items()))
+        return (bool(unsigned), region, timeout, max_pool_connections, kwargs)
+
+    def get_client(
+        self,
+        unsigned: bool = True,
+        region: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_pool_connections: Optional[int] = None,
+        **client_kwargs,
+    ):
+        """
+        Get the shared S3 client for the given access settings, creating
+        it on first use.
+
+        Parameters:
+            unsigned (bool): If True, the client makes anonymous requests.
+            region (str, optional): Region name for the client.
+            timeout (float, optional): Connect and read timeout in seconds,
+                   else the botocore default.
+            max_pool_connections (int, optional): Connection pool size,
+                   else the registry's default. Clients of different
+                   sizes are kept side by side.
+            client_kwargs: parameters for boto3.client:
+                   region_name, aws_access_key_id, aws_secret_access_key, etc.
+
+        Returns:
+            A boto3 S3 client.
+        """
+        if max_pool_connections is None:
+            max_pool_connections = self.max_pool_connections
+        key = self._key(unsigned, region, timeout, max_pool_connections, client_kwargs)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._create_client(
+                        unsigned,
+                        region,
+                        timeout,
+                        max_pool_connections,
+                        dict(client_kwargs),
+                    )
+                    self._clients[key] = client
+        return client
+
+    def _create_client(
+        self,
+        unsigned: bool,
+        region: Optional[str],
+        timeout: Optional[float],
+        max_pool_connections: int,
+        client_kwargs,
+    ):
+        # Called with the lock held, boto3 sessions are not thread-safe
+        config = Config(
+            max_pool_connections=max_pool_connections,
+            # RetryPolicy retries every fetch, botocore retrying too multiplies
+            retries={"total_max_attempts": 1},
+        )
+        if timeout is not None:
+            config = config.merge(Config(connect_timeout=timeout, read_timeout=timeout))
+        if unsigned:
+            config = config.merge(Config(signature_version=UNSIGNED))
+        if client_kwargs.get("config") is not None:
+            config = config.merge(client_kwargs.pop("config"))
+        if region is not None:
+            client_kwargs["region_name"] = region
+        if self._session is None:
+            self._session = boto3.session.Session()
+        return self._session.client("s3", config=config, **client_kwargs)
+
+    def set_max_pool_connections(self, max_pool_connections: int) -> None:
+        """
+        Change the default connection pool size. Clients are keyed by
+        their pool size, so existing ones stay in use by whoever asks for
+        their size and new ones are built for the new default.
+
+        Parameters:
+            max_pool_connections (int): Connections per client.
+        """
+        with self._lock:
+            self.max_pool_connections = max_pool_connections
+
+    def clear(self) -> None:
+        """Drop all cached clients and the underlying boto3 session."""
+        with self._lock:
+            self._clients = {}
+            self._session = None
+
+
+# Shared by every S3 fetch in this module
+s3_client_registry = S3ClientRegistry()
+
+
+def fetch_S3(
+    s3url,
+    unsigned=True,
+    region=None,
+    rawbytes=False,
+    streaming=False,
+    byte_range=None,
+    info=None,
+    validators=None,
+    timeout=None,
+    **client_kwargs,
+):
     # default is JSON, but can return raw bytes
+    # or, if streaming, the unread response body
+    # byte_range is an inclusive (first, last) byte pair, which gives 206
+    # info, if a dict, is filled with the lowercased response headers
+    # validators, the etag and last-modified of a cached copy, give 304
+    # if it is still current
+    # timeout, in seconds, applies to connecting and to each read
     # print("Trying S3, unsigned=",unsigned,"region=",region)
     bucket_prefix = "s3://"
     mybucket, mykey = s3url_to_bucketkey(s3url, bucket_prefix=bucket_prefix)
     # print("Looking for: ",mybucket,mykey)
-    if unsigned:
-        if region != None:
-            s3_client = boto3.client(
-                "s3",
-                config=Config(signature_version=UNSIGNED),
+    s3_client = s3_client_registry.get_client(
+        unsigned=unsigned, region=region, timeout=timeout, **client_kwargs
+    )
+
+    params = {"Bucket": mybucket, "Key": mykey}
+    if byte_range is not None:
+        params["Range"] = "bytes=%d-%d" % byte_range
+    if validators and validators.get("etag"):
+        params["IfNoneMatch"] = validators["etag"]
+    if validators and validators.get("last-modified"):
+        params["IfModifiedSince"] = parsedate_to_datetime(validators["last-modified"])
+    try:
+        response = s3_client.get_object(**params)
+    except ClientError as e:
+        # boto raises on 304 Not Modified
+        if e.response.get("Error", {}).get("Code") != "304":
+            raise
+        response = e.response
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    if info is not None:
+        info.update(response.get("ResponseMetadata", {}).get("HTTPHeaders", {}))
+    catalog = None
+    # print("  Success S3 unsigned",status)
+    if "Body" in response and status in (200, 206) and streaming:
+        catalog = response["Body"]
+    elif "Body" in response and status in (200, 206):
+        catalog_bytes = response["Body"].read()
+        if rawbytes:
+            catalog = catalog_bytes
+        else:
+            catalog = json.loads(catalog_bytes)
+    elif status != 304:
+        print("Error, status = ", status)
+    return status, catalog
+
+
+class HTTPSessionPool:
+    """
+    A shared requests.Session for every HTTP(S) fetch in this module, so
+    connections are kept alive and reused instead of doing a new TCP+TLS
+    handshake per file.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+        compress: bool = True,
+    ) -> None:
+        """
+        Parameters:
+            pool_maxsize (int): Kept-alive connections per host.
+            host_pool_sizes (dict, optional): Pool size overrides per host,
+                         e.g. {"heliocloud.org": 4}, or per URL prefix.
+            compress (bool): If True, ask servers for gzip/deflate encoded
+                         responses, otherwise request identity encoding.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(host_pool_sizes or {})
+        self.compress = compress
+        self._session = None
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        pool_maxsize: Optional[int] = None,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+        compress: Optional[bool] = None,
+    ) -> None:
+        """
+        Change the pool settings, see __init__. Options left as None keep
+        their current value. The current session is closed and a new one
+        built on next use.
+        """
+        with self._lock:
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if host_pool_sizes is not None:
+                self.host_pool_sizes.update(host_pool_sizes)
+            if compress is not None:
+                self.compress = compress
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+
+    def variant(self, **options) -> "HTTPSessionPool":
+        """
+        A pool with this pool's settings changed by options (see
+        configure), e.g. for the http_options of one CloudCatalog, so they
+        do not change the session of everyone else. Callers asking for
+        the same options share one pool.
+        """
+        key = tuple(sorted((key, repr(val)) for key, val in options.items()))
+        with self._lock:
+            pool = self._variants.get(key)
+            if pool is None:
+                pool = HTTPSessionPool(
+                    self.pool_maxsize, self.host_pool_sizes, self.compress
+                )
+                pool.configure(**options)
+                self._variants[key] = pool
+        return pool
+
+    def get_session(self) -> requests.Session:
+        """
+        Returns:
+            The shared session, created on first use.
+        """
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # requests picks the longest matching prefix, so hosts override
+        for host, pool_size in self.host_pool_sizes.items():
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+            if host.startswith("http"):
+                session.mount(host, adapter)
+            else:
+                session.mount(f"http://{host}/", adapter)
+                session.mount(f"https://{host}/", adapter)
+        if not self.compress:
+            session.headers["Accept-Encoding"] = "identity"
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """A GET request on the shared session, see requests.get."""
+        return self.get_session().get(url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections, also those of the variants."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            variants = list(self._variants.values())
+        for pool in variants:
+            pool.close()
+
+
+# Shared by every HTTP(S) fetch in this module
+http_session_pool = HTTPSessionPool()
+
+
+def fetch_url(
+    s3url,
+    rawbytes=False,
+    streaming=False,
+    byte_range=None,
+    info=None,
+    validators=None,
+    timeout=None,
+    session_pool=None,
+):
+    # default is JSON, but can return raw bytes
+    # or, if streaming, the unread response body
+    # byte_range is an inclusive (first, last) byte pair, which gives 206
+    # info, if a dict, is filled with the lowercased response headers
+    # validators, the etag and last-modified of a cached copy, give 304
+    # if it is still current
+    # timeout, in seconds, applies to connecting and to each read
+    # session_pool, an HTTPSessionPool, else the shared http_session_pool
+    httpurl = s3url_to_https(s3url)
+    headers = {}
+    if byte_range is not None:
+        # Offsets must refer to the stored bytes, not a compressed encoding
+        headers = {"Range": "bytes=%d-%d" % byte_range, "Accept-Encoding": "identity"}
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last-modified"):
+        headers["If-Modified-Since"] = validators["last-modified"]
+    if session_pool is None:
+        session_pool = http_session_pool
+    response = session_pool.get(
+        httpurl, stream=streaming, headers=headers, timeout=timeout
+    )
+    status = response.status_code
+    if info is not None:
+        info.update((key.lower(), val) for key, val in response.headers.items())
+    if status not in (200, 206):
+        catalog = None
+        response.close()
+    elif streaming:
+        # Undo any gzip transfer encoding while reading, like .content does
+        response.raw.decode_content = True
+        catalog = response.raw
+    elif rawbytes:
+        catalog = response.content
+    else:
+        catalog = response.json()
+    return status, catalog
+
+
+def _atomic_write(path: str, data: Union[bytes, str, Callable[[str], None]]) -> None:
+    """
+    Write a file then rename it into place, so concurrent readers (other
+    threads or processes sharing the cache folder) never see it partial.
+    The temporary file is removed if writing fails, and the error raised.
+
+    Parameters:
+        path (str): The file to write.
+        data: bytes or text to write, or a function that writes the file
+              at the (temporary) path it is given.
+    """
+    tmppath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if callable(data):
+            data(tmppath)
+        else:
+            with open(tmppath, "wb" if isinstance(data, bytes) else "w") as file:
+                file.write(data)
+        os.replace(tmppath, path)
+    except BaseException:
+        if os.path.exists(tmppath):
+            os.remove(tmppath)
+        raise
+
+
+def s3url_to_endpoint(s3url):
+    """
+    The endpoint an S3 URL or https URL is served from, i.e. the bucket
+    name for S3 and scheme://host for https.
+    """
+    if s3url.startswith("http"):
+        parsed = urlparse(s3url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+    mybucket, _ = s3url_to_bucketkey(s3url)
+    return mybucket
+
+
+class AccessStrategyCache:
+    """
+    Remembers which of the fetch_S3orURL access methods works for each
+    endpoint, so later fetches try the known-good method first and skip
+    methods that recently failed. A method is probed again once its
+    record is older than the TTL, or straight away if the known-good
+    method starts failing.
+
+    The records can be persisted to JSON files, one per cache folder in
+    use, each kept up to date with all of them.
+    """
+
+    # The fetch_S3orURL cascade, in the order it is tried when nothing is known
+    METHODS = ("unsigned", "signed", "region", "https")
+
+    def __init__(self, ttl: float = 3600.0, path: Optional[str] = None) -> None:
+        """
+        Parameters:
+            ttl (float): Seconds a success or failure record is trusted.
+            path (str, optional): JSON file the records are persisted to.
+        """
+        self.ttl = ttl
+        self.paths = []
+        self._records = {}
+        self._stats = {"fetches": 0, "attempts": 0, "skipped": 0}
+        self._lock = threading.Lock()
+        if path is not None:
+            self.load(path)
+
+    def order(self, endpoint: str, methods: Tuple[str, ...] = METHODS) -> List[str]:
+        """
+        The methods to try for an endpoint: known-good first, then untried
+        or expired ones, leaving out recent failures. If every method has
+        recently failed, the full cascade is returned.
+        """
+        now = time.time()
+        records = self._records.get(endpoint, {})
+        good, unknown = [], []
+        for method in methods:
+            record = records.get(method)
+            if record is None or now - record["time"] > self.ttl:
+                unknown.append(method)
+            elif record["ok"]:
+                good.append(method)
+        return (good + unknown) or list(methods)
+
+    def record(self, endpoint: str, method: str, ok: bool) -> None:
+        """Store the outcome of one access method for an endpoint."""
+        now = time.time()
+        with self._lock:
+            records = self._records.setdefault(endpoint, {})
+            previous = records.get(method)
+            records[method] = {"ok": ok, "time": now}
+            changed = (
+                previous is None
+                or previous["ok"] != ok
+                or now - previous["time"] > self.ttl
+            )
+        if changed and self.paths:
+            self.save()
+
+    def count(
+        self, methods: Tuple[str, ...], winner: Optional[str], attempts: int
+    ) -> None:
+        """
+        Update the stats for one fetch. Skipped steps are those the plain
+        cascade would have tried that this fetch did not need.
+        """
+        cascade = methods.index(winner) + 1 if winner is not None else len(methods)
+        with self._lock:
+            self._stats["fetches"] += 1
+            self._stats["attempts"] += attempts
+            self._stats["skipped"] += max(cascade - attempts, 0)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            A dict with the number of fetches, access attempts made, and
+            cascade steps skipped thanks to the cache.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def load(self, path: str) -> None:
+        """
+        Merge records from a JSON file (if it exists) and persist to it
+        too from now on. Files already loaded are not read again.
+        """
+        with self._lock:
+            if path in self.paths:
+                return
+            self.paths.append(path)
+        try:
+            with open(path) as file:
+                records = json.load(file)
+        except FileNotFoundError:
+            records = {}
+        except (OSError, ValueError) as e:
+            logging.debug(f"Ignoring unreadable access strategy file {path}: {e}")
+            records = {}
+        with self._lock:
+            for endpoint, methods in records.items():
+                self._records.setdefault(endpoint, {}).update(methods)
+        # Bring the file up to date with what this process already knows
+        self._save_to([path])
+
+    def save(self) -> None:
+        """Write the records to the persistence files, if any are set."""
+        with self._lock:
+            paths = list(self.paths)
+        self._save_to(paths)
+
+    def _save_to(self, paths: List[str]) -> None:
+        with self._lock:
+            records = json.dumps(self._records, indent=4)
+        for path in paths:
+            try:
+                _atomic_write(path, records)
+            except OSError as e:
+                logging.debug(f"Could not save access strategies to {path}: {e}")
+
+    def clear(self) -> None:
+        """Forget all records and reset the stats."""
+        with self._lock:
+            self._records = {}
+            self._stats = {"fetches": 0, "attempts": 0, "skipped": 0}
+
+
+# Shared by every fetch_S3orURL call in this module
+access_strategy_cache = AccessStrategyCache()
+
+
+def is_missing_key(error: Exception) -> bool:
+    """True if a boto error means the key does not exist (vs. no access)."""
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in ("NoSuchKey", "404")
+
+
+def fetch_method(
+    method,
+    s3url,
+    region="us-east-1",
+    rawbytes=False,
+    streaming=False,
+    byte_range=None,
+    info=None,
+    validators=None,
+    timeout=None,
+    session_pool=None,
+    **client_kwargs,
+):
+    """
+    Fetch with a single access method of the fetch_S3orURL cascade.
+    session_pool is used for https, client_kwargs for S3.
+
+    Returns:
+        The (status, catalog) tuple from fetch_S3 or fetch_url.
+    """
+    if method == "https":
+        return fetch_url(
+            s3url,
+            rawbytes=rawbytes,
+            streaming=streaming,
+            byte_range=byte_range,
+            info=info,
+            validators=validators,
+            timeout=timeout,
+            session_pool=session_pool,
+        )
+    return fetch_S3(
+        s3url,
+        unsigned=method != "signed",
+        region=region if method == "region" else None,
+        rawbytes=rawbytes,
+        streaming=streaming,
+        byte_range=byte_range,
+        info=info,
+        validators=validators,
+        timeout=timeout,
+        **client_kwargs,
+    )
+
+
+class RetryPolicy:
+    """
+    Retries one access method of fetch_S3orURL on transient failures
+    (throttling, 5xx, timeouts, dropped connections) with exponential
+    backoff and full jitter, so one slow or throttled GET neither stalls
+    a stream nor drops a year from a catalog request.
+
+    With hedging on, a duplicate GET is fired when a fetch takes longer
+    than the hedge_quantile latency of recent fetches from the same
+    endpoint, and whichever answers first is used. This cuts the tail
+    latency of large batches at the cost of a few extra requests.
+    """
+
+    # HTTP statuses and S3 error codes worth another try
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    RETRY_CODES = (
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+        "RequestTimeout",
+        "RequestTimeTooSkewed",
+        "InternalError",
+        "ServiceUnavailable",
+    )
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.2,
+        max_backoff: float = 10.0,
+        timeout: Optional[float] = 60.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_window: int = 200,
+        transport: Optional[Callable] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """
+        Parameters:
+            max_attempts (int): Tries per access method, 1 disables retries.
+            backoff (float): Seconds of the first backoff, doubled on
+                         each retry. The actual wait is random between 0
+                         and that (full jitter).
+            max_backoff (float): Cap on the backoff in seconds.
+            timeout (float, optional): Seconds to connect and per read
+                         for each request, None waits forever.
+            hedge (bool): If True, fire a duplicate request when a fetch
+                         is slower than hedge_quantile of recent ones.
+            hedge_quantile (float): Latency quantile that triggers a hedge.
+            hedge_min_samples (int): Latencies of an endpoint needed
+                         before hedging it.
+            hedge_window (int): Recent latencies kept per endpoint.
+            transport (callable, optional): Does one request, with the
+                         signature and (status, catalog) result of
+                         fetch_method, which is the default. For tests.
+            sleep (callable): Waits between retries, for tests.
+            rng (random.Random, optional): Source of the jitter.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_window = hedge_window
+        self.transport = transport
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self._latencies = {}
+        self._stats = {"requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+        self._executor = None
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def configure(self, **options) -> None:
+        """Change any of the __init__ settings."""
+        for name, value in options.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise TypeError(f"Unknown retry option {name}")
+            setattr(self, name, value)
+
+    def variant(self, **options) -> "RetryPolicy":
+        """
+        A policy with this policy's settings changed by options (see
+        configure), e.g. for the retry_options of one CloudCatalog, so they
+        do not change the retries of everyone else. Callers asking for the
+        same options share one policy, and its latencies and stats.
+        """
+        key = tuple(sorted((key, repr(val)) for key, val in options.items()))
+        with self._lock:
+            policy = self._variants.get(key)
+            if policy is None:
+                settings = inspect.signature(RetryPolicy.__init__).parameters
+                policy = RetryPolicy(
+                    **{name: getattr(self, name) for name in settings if name != "self"}
+                )
+                policy.configure(**options)
+                self._variants[key] = policy
+        return policy
+
+    def is_transient(self, error: Exception) -> bool:
+        """True if a failed request is worth retrying as is."""
+        if isinstance(error, ClientError):
+            response = error.response
+            status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            code = response.get("Error", {}).get("Code")
+            return status in self.RETRY_STATUSES or code in self.RETRY_CODES
+        return isinstance(
+            error,
+            (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+                BotoConnectionError,
+                HTTPClientError,
+                ConnectionError,
+                TimeoutError,
+            ),
+        )
+
+    def backoff_delay(self, retry: int) -> float:
+        """Seconds to wait before retry number retry (from 0)."""
+        return self.rng.uniform(0, min(self.max_backoff, self.backoff * 2**retry))
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """
+        Seconds after which a fetch from endpoint is hedged, or None if
+        hedging is off or there are too few latencies to tell.
+        """
+        if not self.hedge:
+            return None
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+        if len(latencies) < max(self.hedge_min_samples, 1):
+            return None
+        return latencies[
+            min(int(len(latencies) * self.hedge_quantile), len(latencies) - 1)
+        ]
+
+    def call(self, method: str, s3url: str, info: Optional[Dict] = None, **kwargs):
+        """
+        Fetch s3url with one access method, retrying transient failures.
+        Other failures are raised straight away, for the cascade to try
+        the next method.
+
+        Parameters:
+            method (str): Access method, see AccessStrategyCache.METHODS.
+            s3url (str): The S3 or https URL to fetch.
+            info (dict, optional): Filled with the response headers of
+                         the request that was used, see fetch_S3orURL.
+            kwargs: Passed on to the transport, see fetch_method.
+
+        Returns:
+            The (status, catalog) tuple of the last attempt.
+        """
+        endpoint = s3url_to_endpoint(s3url)
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        for retry in range(max(self.max_attempts, 1)):
+            if retry > 0:
+                with self._lock:
+                    self._stats["retries"] += 1
+                self.sleep(self.backoff_delay(retry - 1))
+            last = retry + 1 >= self.max_attempts
+            try:
+                status, catalog, attempt_info = self._hedged(
+                    endpoint, method, s3url, info is not None, kwargs
+                )
+            except Exception as e:
+                if last or not self.is_transient(e):
+                    raise
+                logging.debug(f"Retrying {s3url} via {method} after: {e}")
+                continue
+            if status in self.RETRY_STATUSES and not last:
+                logging.debug(f"Retrying {s3url} via {method} after status {status}")
+                continue
+            break
+        if info is not None:
+            info.update(attempt_info)
+        return status, catalog
+
+    def _hedged(self, endpoint, method, s3url, want_info, kwargs):
+        delay = self.hedge_delay(endpoint)
+        if delay is None:
+            return self._attempt(endpoint, method, s3url, want_info, kwargs)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="hedge")
+            executor = self._executor
+        attempt = (self._attempt, endpoint, method, s3url, want_info, kwargs)
+        first = executor.submit(*attempt)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        with self._lock:
+            self._stats["hedges"] += 1
+        hedge = executor.submit(*attempt)
+        pending, error = {first, hedge}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._stats["hedge_wins"] += 1
+                for other in pending:
+                    other.add_done_callback(self._discard)
+                return future.result()
+        raise error
+
+    @staticmethod
+    def _discard(future) -> None:
+        # The losing request of a hedge, close it if it was streaming
+        if future.exception() is None:
+            catalog = future.result()[1]
+            if hasattr(catalog, "close"):
+                catalog.close()
+
+    def _attempt(self, endpoint, method, s3url, want_info, kwargs):
+        # Each attempt gets its own info, hedged ones run side by side
+        info = {} if want_info else None
+        transport = self.transport if self.transport is not None else fetch_method
+        begin = time.monotonic()
+        status, catalog = transport(method, s3url, info=info, **kwargs)
+        if status not in self.RETRY_STATUSES:
+            with self._lock:
+                self._stats["requests"] += 1
+                latencies = self._latencies.get(endpoint)
+                if latencies is None or latencies.maxlen != self.hedge_window:
+                    latencies = deque(latencies or (), maxlen=self.hedge_window)
+                    self._latencies[endpoint] = latencies
+                latencies.append(time.monotonic() - begin)
+        return status, catalog, info or {}
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            A dict with the number of successful requests, retries,
+            hedged requests fired and hedges that answered first.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        """Forget the recorded latencies and reset the stats."""
+        with self._lock:
+            self._latencies = {}
+            self._stats = {"requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+
+
+# Shared by every fetch_S3orURL call in this module
+retry_policy = RetryPolicy()
+
+
+def fetch_S3orURL(
+    s3url,
+    region="us-east-1",
+    rawbytes=False,
+    streaming=False,
+    byte_range=None,
+    info=None,
+    validators=None,
+    policy=None,
+    **client_kwargs,
+):
+    """To get around vagualities of S3 access, this tries a cascade of:
+    fetch S3 unsigned/anonymous
+    straight fetch of S3 using your existing permissions
+    fetch S3 for a specified region only, defaulting to us-east-1
+    fetch the S3 contents via the AWS-equivalent URL
+
+    The method that worked last time for the same bucket or host is tried
+    first, and recently failed ones are skipped, see AccessStrategyCache.
+    https URLs only use the last step.
+
+    With rawbytes, the content is returned as a BytesIO that shares the
+    downloaded buffer. With streaming, the unread response body is
+    returned instead, a forward-only file-like object that can be parsed
+    while it downloads and is never held in memory whole.
+
+    byte_range asks for an inclusive (first, last) byte pair only. Servers
+    may ignore it and send everything, check info["content-range"] (info
+    is filled with the lowercased response headers of the final attempt,
+    and its HTTP status under "status").
+
+    validators makes the request conditional: a dict with the "etag"
+    and/or "last-modified" headers of a cached copy. If that copy is still
+    current, None is returned and info["status"] is 304.
+
+    Each method is retried on transient errors, and optionally hedged,
+    following policy, a RetryPolicy, else the shared retry_policy.
+
+    Returns None if the object is missing or cannot be fetched.
+    """
+    if policy is None:
+        policy = retry_policy
+    endpoint = s3url_to_endpoint(s3url)
+    if s3url.startswith("http"):
+        methods = ("https",)
+    else:
+        methods = AccessStrategyCache.METHODS
+
+    catalog, winner, attempts = None, None, 0
+    for method in access_strategy_cache.order(endpoint, methods):
+        attempts += 1
+        if info is not None:
+            info.clear()
+        try:
+            status, catalog = policy.call(
+                method,
+                s3url,
                 region=region,
+                rawbytes=rawbytes,
+                streaming=streaming,
+                byte_range=byte_range,
+                info=info,
+                validators=validators,
                 **client_kwargs,
             )
+        except Exception as e:
+            if is_missing_key(e):
+                # Access worked, the object just is not there
+                if info is not None:
+                    info["status"] = 404
+                access_strategy_cache.record(endpoint, method, True)
+                winner, catalog = method, None
+                break
+            logging.debug(f"Fetch of {s3url} via {method} failed: {e}")
+            access_strategy_cache.record(endpoint, method, False)
+            continue
+        if info is not None:
+            info["status"] = status
+        if status in (200, 206, 304, 404):
+            access_strategy_cache.record(endpoint, method, True)
+            winner = method
+            break
+        access_strategy_cache.record(endpoint, method, False)
+        catalog = None
+    access_strategy_cache.count(methods, winner, attempts)
+    if winner is None:
+        logging.warning(f"Could not fetch {s3url} by any access method")
+
+    if catalog is None or streaming:
+        return catalog
+    if rawbytes:
+        # BytesIO only copies the bytes if they are written to
+        return BytesIO(catalog)
+    else:
+        return catalog
+
+
+class RangeFile(io.RawIOBase):
+    """
+    A read-only, seekable file over an S3 or https object that only
+    downloads the parts that are read, using byte-range requests of at
+    least block_size bytes. Recently read blocks are kept in memory.
+
+    If the server ignores the Range header, the whole object arrives with
+    the first request and is served from memory; supports_ranges is then
+    False.
+    """
+
+    def __init__(
+        self,
+        s3url: str,
+        block_size: int = 65536,
+        max_blocks: int = 16,
+        region: str = "us-east-1",
+        **client_kwargs,
+    ) -> None:
+        """
+        Parameters:
+            s3url (str): S3 or https URL of the object.
+            block_size (int): Bytes fetched per request for small reads.
+            max_blocks (int): How many blocks are kept in memory.
+            region (str): Region passed on to fetch_S3orURL.
+            client_kwargs: parameters for boto3.client.
+
+        Raises:
+            FileNotFoundError if the object is missing (with errno ENOENT)
+            or cannot be fetched.
+        """
+        super().__init__()
+        self.s3url = s3url
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.region = region
+        self.client_kwargs = client_kwargs
+        self.requests = 0
+        self._blocks = OrderedDict()
+        self._content = None
+        self._pos = 0
+
+        info = {}
+        first = self._fetch((0, block_size - 1), info)
+        if first is None:
+            if info.get("status") == 404:
+                raise FileNotFoundError(errno.ENOENT, "No such object", s3url)
+            raise FileNotFoundError(f"Cannot fetch {s3url}")
+        match = re.fullmatch(r"bytes \d+-\d+/(\d+)", info.get("content-range", ""))
+        self.supports_ranges = match is not None
+        if self.supports_ranges:
+            self.size = int(match.group(1))
+            self._blocks[0] = first
         else:
-            s3_client = boto3.client(
-                "s3", config=Config(signature_version=UNSIGNED), **client_kwargs
+            self.size = len(first)
+            self._content = first
+
+    def _fetch(self, byte_range: Tuple[int, int], info: Optional[Dict] = None):
+        self.requests += 1
+        fr_bytes_file = fetch_S3orURL(
+            self.s3url,
+            region=self.region,
+            rawbytes=True,
+            byte_range=byte_range,
+            info=info,
+            **self.client_kwargs,
+        )
+        return None if fr_bytes_file is None else fr_bytes_file.getvalue()
+
+    def _block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is None:
+            first = index * self.block_size
+            last = min(first + self.block_size, self.size) - 1
+            block = self._fetch((first, last))
+            if block is None:
+                raise OSError(f"Range request for {self.s3url} failed")
+            self._blocks[index] = block
+            if len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(index)
+        return block
+
+    def pread(self, offset: int, length: int) -> bytes:
+        """
+        Read length bytes at offset without moving the file position.
+        Fewer bytes are returned at the end of the object.
+        """
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b""
+        if self._content is not None:
+            return self._content[offset:end]
+        if end - offset > self.block_size:
+            # Large reads go out as one request and bypass the block cache
+            data = self._fetch((offset, end - 1))
+            if data is None:
+                raise OSError(f"Range request for {self.s3url} failed")
+            return data
+        first, last = offset // self.block_size, (end - 1) // self.block_size
+        data = b"".join(self._block(index) for index in range(first, last + 1))
+        start = offset - first * self.block_size
+        return data[start : start + end - offset]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        data = self.pread(self._pos, len(buffer))
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def readall(self) -> bytes:
+        data = self.pread(self._pos, self.size - self._pos)
+        self._pos += len(data)
+        return data
+
+
+def _index_line_at(rangefile: RangeFile, offset: int, data_start: int):
+    """
+    Find the first index row starting at or after offset.
+
+    Returns:
+        A tuple of the row's byte offset and its start time, or
+        (None, None) past the last row.
+    """
+    pos = data_start
+    if offset > data_start:
+        # Skip to the end of the row offset - 1 is in
+        scan = offset - 1
+        while True:
+            # Stop at the block boundary so a probe is usually one request
+            chunk = rangefile.pread(
+                scan, rangefile.block_size - scan % rangefile.block_size
             )
-    else:
-        if region != None:
-            s3_client = boto3.client("s3", region=region, **client_kwargs)
+            if not chunk:
+                return None, None
+            newline = chunk.find(b"\n")
+            if newline >= 0:
+                pos = scan + newline + 1
+                break
+            scan += len(chunk)
+    field = rangefile.pread(pos, 64).split(b",", 1)[0].strip().strip(b'"')
+    if not field:
+        return None, None
+    # Restricted ISO 8601, parsed naive like CloudCatalog.date2datetime
+    return pos, pd.Timestamp(field.decode().rstrip("Z"))
+
+
+def _bisect_index(rangefile: RangeFile, data_start: int, target: datetime):
+    """
+    Binary search a time-ordered index by byte offset for the first row
+    whose start is at or after target.
+
+    Returns:
+        A (low, high) pair of row offsets with low <= that row's offset
+        <= high, about one block apart.
+    """
+    low, high = data_start, rangefile.size
+    search_high = high
+    while search_high - low > rangefile.block_size:
+        mid = (low + search_high) // 2
+        pos, start = _index_line_at(rangefile, mid, data_start)
+        if pos is None or pos >= high:
+            # No row begins between mid and high
+            search_high = mid
+        elif start < target:
+            low = pos
+        else:
+            high = search_high = pos
+    return low, high
+
+
+def fetch_index_slice(
+    s3url: str,
+    start_date: datetime,
+    stop_date: datetime,
+    lookback: timedelta = timedelta(days=1),
+    block_size: int = 16384,
+    region: str = "us-east-1",
+    info: Optional[Dict] = None,
+    **client_kwargs,
+) -> Optional[BytesIO]:
+    """
+    Fetch only the rows of a time-ordered CSV index that can overlap
+    [start_date, stop_date), plus its header line, by binary searching
+    the start column with byte-range requests. The result still needs
+    the exact time filtering of request_cloud_catalog.
+
+    Parameters:
+        s3url (str): S3 or https URL of the index file.
+        start_date (datetime): Start of the requested window.
+        stop_date (datetime): End of the requested window.
+        lookback (timedelta): How long before start_date a row may start
+                     and still overlap it, i.e. the longest file duration.
+        block_size (int): Bytes fetched per binary search probe.
+        region (str): Region passed on to fetch_S3orURL.
+        info (dict, optional): Gets "status" 404 if the index is missing,
+                     as opposed to not fetchable.
+        client_kwargs: parameters for boto3.client.
+
+    Returns:
+        A BytesIO with the CSV header and the selected rows, the whole file
+        if the server does not support ranges, or None if it is missing.
+    """
+    try:
+        rangefile = RangeFile(
+            s3url, block_size=block_size, region=region, **client_kwargs
+        )
+    except FileNotFoundError as e:
+        if info is not None and e.errno == errno.ENOENT:
+            info["status"] = 404
+        return None
+    if not rangefile.supports_ranges:
+        return BytesIO(rangefile.readall())
+
+    # The first line is kept whether it is a header or not, so the slice
+    # parses exactly like the whole file would
+    header_end = rangefile.pread(0, block_size).find(b"\n") + 1
+    if header_end == 0:
+        return BytesIO(rangefile.readall())
+    header = rangefile.pread(0, header_end)
+
+    try:
+        low, _ = _bisect_index(rangefile, header_end, start_date - lookback)
+        _, high = _bisect_index(rangefile, header_end, stop_date)
+    except ValueError as e:
+        logging.debug(f"Cannot binary search {s3url}, reading all of it: {e}")
+        return BytesIO(rangefile.readall())
+    body = rangefile.pread(low, high - low)
+    logging.debug(
+        f"Range read {len(body)} of {rangefile.size} bytes of {s3url} "
+        f"in {rangefile.requests} requests"
+    )
+    return BytesIO(header + body)
+
+
+@contextlib.contextmanager
+def open_index(source):
+    """
+    Open a year index for reading, decompressing zip (csv-zip) and gzip
+    content on the fly as it is read, so the uncompressed CSV is never
+    held in memory whole.
+
+    Parameters:
+        source: Path or binary file object of the index.
+
+    Yields:
+        A binary file object of the CSV content.
+    """
+    with contextlib.ExitStack() as stack:
+        if isinstance(source, (str, os.PathLike)):
+            source = stack.enter_context(open(source, "rb"))
+        position = source.tell()
+        magic = source.read(4)
+        source.seek(position)
+        if magic == b"PK\x03\x04":
+            archive = stack.enter_context(zipfile.ZipFile(source))
+            members = [name for name in archive.namelist() if not name.endswith("/")]
+            # An archive holds one index, prefer the .csv if there is more
+            csvs = [name for name in members if name.lower().endswith(".csv")]
+            yield stack.enter_context(archive.open((csvs or members)[0]))
+        elif magic[:2] == b"\x1f\x8b":
+            yield stack.enter_context(gzip.GzipFile(fileobj=source))
+        else:
+            yield source
+
+
+def parse_iso8601(values, errors: str = "coerce") -> np.ndarray:
+    """
+    Parse the spec's restricted ISO 8601 timestamps, YYYY-MM-DD[THH[:MM
+    [:SS[.f...]]]][Z], in one vectorized pass whatever mix of precisions
+    the column holds. Trailing Z (UTC) is dropped, the result is naive UTC.
+    Uses pyarrow's parser when installed, else numpy's.
+
+    Parameters:
+        values: Series or array of strings. Missing values give NaT.
+        errors (str): "coerce" logs a warning listing the rows that cannot
+                     be parsed and gives NaT for them, "raise" raises.
+
+    Returns:
+        A datetime64[ns] numpy array.
+
+    Raises:
+        ValueError if errors is "raise" and a row cannot be parsed.
+    """
+    series = pd.Series(values, copy=False)
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            series = series.dt.tz_convert(None)
+        return series.to_numpy(dtype="datetime64[ns]")
+    try:
+        return _parse_iso8601_fast(series)
+    except (ValueError, TypeError):
+        pass
+
+    # Some rows are off, parse row by row to find them
+    stripped = series.astype(object).where(series.notna(), None)
+    stripped = stripped.map(
+        lambda v: v.strip().removesuffix("Z") if isinstance(v, str) else v
+    )
+    parsed = pd.to_datetime(stripped, format="ISO8601", errors="coerce")
+    bad = np.flatnonzero(parsed.isna().to_numpy() & series.notna().to_numpy())
+    if len(bad):
+        examples = ", ".join(f"{row}: {series.iloc[row]!r}" for row in bad[:5])
+        message = f"Cannot parse {len(bad)} timestamps, rows {examples}"
+        if errors == "raise":
+            raise ValueError(message)
+        logging.warning(message)
+    return parsed.to_numpy(dtype="datetime64[ns]")
+
+
+def _parse_iso8601_fast(series: pd.Series) -> np.ndarray:
+    """parse_iso8601 for well-formed columns, raises on any bad row."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+    if pa is not None:
+        strings = pa.array(series, type=pa.string(), from_pandas=True)
+        timestamps = pc.cast(pc.utf8_rtrim(strings, characters="Z"), pa.timestamp("ns"))
+        return timestamps.to_numpy(zero_copy_only=False)
+    strings = series.str.removesuffix("Z").fillna("NaT")
+    return strings.to_numpy(dtype=str).astype("datetime64[ns]")
+
+
+def _import_pyarrow(module: str = "pyarrow", purpose: str = "Parquet indices"):
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{purpose} need pyarrow, install it with 'pip install pyarrow'."
+        ) from e
+
+
+# Column order of an index file, used when a file does not name them
+INDEX_COLUMNS = ("start", "stop", "datakey", "filesize")
+
+# Parse dtypes of index columns, unless request_cloud_catalog is told otherwise
+INDEX_DTYPES = {"filesize": "int64"}
+
+
+def _index_column_position(names: List[str], name: str) -> Optional[int]:
+    """
+    Where column name is among the column names of an index file. The
+    spec columns are found by position when the file names them otherwise.
+    """
+    if name in names:
+        return names.index(name)
+    if name in INDEX_COLUMNS and INDEX_COLUMNS.index(name) < len(names):
+        return INDEX_COLUMNS.index(name)
+    return None
+
+
+def _naive_utc(value):
+    """A timestamp or ISO 8601 string as a naive UTC pd.Timestamp."""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert(None)
+    return value
+
+
+def _row_group_overlaps(
+    row_group, start_index: int, stop_index: int, start_date, stop_date
+) -> bool:
+    """
+    Whether the statistics of a Parquet row group allow rows with
+    stop >= start_date and start < stop_date. Groups without usable
+    statistics are kept.
+    """
+    try:
+        first = row_group.column(start_index).statistics
+        last = row_group.column(stop_index).statistics
+        if first is None or last is None:
+            return True
+        if not (first.has_min_max and last.has_min_max):
+            return True
+        return _naive_utc(first.min) < stop_date and _naive_utc(last.max) >= start_date
+    except (ValueError, TypeError):
+        return True
+
+
+def read_parquet_index(
+    source,
+    start_date: datetime,
+    stop_date: datetime,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read a Parquet index, skipping the row groups whose start/stop
+    statistics show they cannot overlap [start_date, stop_date) and the
+    columns that are not needed. With a RangeFile as source, only the
+    footer and the selected column chunks are downloaded. The result
+    still needs the exact time filtering of request_cloud_catalog.
+
+    Parameters:
+        source: Path or seekable file object of the Parquet file.
+        start_date (datetime): Start of the requested window.
+        stop_date (datetime): End of the requested window.
+        columns (list, optional): Columns to read, by spec name (start,
+                     stop, datakey, filesize) or file column name. start
+                     and stop are always read, for the time filter.
+
+    Returns:
+        A pandas DataFrame with the spec column names and timestamps as
+        naive UTC datetimes.
+    """
+    parquet = _import_pyarrow("pyarrow.parquet")
+    parquet_file = parquet.ParquetFile(source)
+    names = parquet_file.schema_arrow.names
+    position = functools.partial(_index_column_position, names)
+
+    start_index = position("start")
+    stop_index = position("stop") if len(names) > 1 else start_index
+    wanted = {start_index, stop_index}
+    if columns is not None:
+        wanted.update(position(name) for name in columns)
+    wanted.discard(None)
+
+    metadata = parquet_file.metadata
+    row_groups = [
+        index
+        for index in range(metadata.num_row_groups)
+        if _row_group_overlaps(
+            metadata.row_group(index), start_index, stop_index, start_date, stop_date
+        )
+    ]
+    logging.debug(f"Reading {len(row_groups)} of {metadata.num_row_groups} row groups")
+    table = parquet_file.read_row_groups(
+        row_groups,
+        columns=None if columns is None else [names[i] for i in sorted(wanted)],
+    )
+    fr = table.to_pandas()
+    fr.rename(
+        columns={
+            names[position(name)]: name
+            for name in INDEX_COLUMNS
+            if position(name) is not None
+        },
+        inplace=True,
+    )
+    for column in fr.columns:
+        if isinstance(fr[column].dtype, pd.DatetimeTZDtype):
+            fr[column] = fr[column].dt.tz_convert(None)
+    return fr
+
+
+def compact_datakeys(fr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store the datakey column of an index compactly: the folder part of
+    each key (up to the last "/"), shared by many files, as a categorical
+    datakey_prefix column and the rest as datakey_suffix. stream and
+    stream_uri take either form, expand_datakeys turns it back.
+
+    Parameters:
+        fr (pd.DataFrame): A request_cloud_catalog result.
+
+    Returns:
+        A DataFrame with the two columns in place of datakey, or fr itself
+        if it has no datakey column.
+    """
+    if "datakey" not in fr.columns:
+        return fr
+    # Regex replaces run in pyarrow for str columns, without Python objects
+    prefix = fr["datakey"].str.replace(r"[^/]*$", "", regex=True).astype("category")
+    suffix = fr["datakey"].str.replace(r"^.*/", "", regex=True)
+    position = fr.columns.get_loc("datakey")
+    fr = fr.drop(columns="datakey")
+    fr.insert(position, "datakey_suffix", suffix)
+    fr.insert(position, "datakey_prefix", prefix)
+    return fr
+
+
+def expand_datakeys(fr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Undo compact_datakeys, returns fr itself if it is not compact.
+    """
+    if "datakey_prefix" not in fr.columns:
+        return fr
+    datakey = fr["datakey_prefix"].astype(str) + fr["datakey_suffix"]
+    position = fr.columns.get_loc("datakey_prefix")
+    fr = fr.drop(columns=["datakey_prefix", "datakey_suffix"])
+    fr.insert(position, "datakey", datakey)
+    return fr
+
+
+def _iter_datakeys(fr: pd.DataFrame) -> Iterator[str]:
+    """The full datakey of each row, whether compact or not."""
+    if "datakey_prefix" not in fr.columns:
+        return iter(fr["datakey"])
+    # Expanded one row at a time, never all at once
+    return (
+        prefix + suffix
+        for prefix, suffix in zip(fr["datakey_prefix"], fr["datakey_suffix"])
+    )
+
+
+# Result types request_cloud_catalog can return, see to_backend
+BACKENDS = ("pandas", "arrow", "polars", "numpy")
+
+
+def _check_backend(backend: str) -> None:
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, not {backend!r}")
+
+
+def to_backend(fr: pd.DataFrame, backend: str = "pandas"):
+    """
+    Convert an index DataFrame to another result type, sharing the
+    column buffers where the target allows it.
+
+    Parameters:
+        fr (pd.DataFrame): A request_cloud_catalog result.
+        backend (str): "pandas" (fr itself), "arrow" (a pyarrow Table,
+                       categorical columns become dictionary arrays),
+                       "polars" (a polars DataFrame, via Arrow) or
+                       "numpy" (a structured array, strings as object
+                       fields holding str, None where missing).
+
+    Returns:
+        The converted result.
+    """
+    _check_backend(backend)
+    if backend == "pandas":
+        return fr
+    if backend == "numpy":
+        return _to_structured(fr)
+    pa = _import_pyarrow(purpose=f"The {backend} backend")
+    table = pa.Table.from_pandas(fr, preserve_index=False)
+    if backend == "arrow":
+        return table
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError(
+            "The polars backend needs polars, install it with 'pip install polars'."
+        ) from e
+    return pl.from_arrow(table)
+
+
+def _to_structured(fr: pd.DataFrame) -> np.ndarray:
+    """to_backend for "numpy"."""
+    fields, values = [], []
+    for name in fr.columns:
+        column = fr[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(column.cat.categories.dtype)
+        if pd.api.types.is_string_dtype(column.dtype):
+            # Not fixed-width unicode, the longest key would size every row
+            array = column.to_numpy(dtype=object, na_value=None)
         else:
-            s3_client = boto3.client("s3", **client_kwargs)
+            array = column.to_numpy()
+        # Timezone-aware datetimes come out as objects
+        if array.dtype == object and pd.api.types.is_datetime64_any_dtype(column.dtype):
+            array = column.dt.tz_convert(None).to_numpy()
+        fields.append((str(name), array.dtype))
+        values.append(array)
+    result = np.empty(len(fr), dtype=fields)
+    for (name, _), array in zip(fields, values):
+        result[name] = array
+    return result
+
+
+class FrameCache:
+    """
+    Thread-safe, process-wide LRU cache of parsed year indices, so
+    repeated or overlapping requests skip both the download and the
+    parse. Entries are evicted least recently used first once their total
+    size (pandas deep memory usage) exceeds max_bytes, and are dropped
+    when looked up after more than max_age seconds.
+
+    Off by default, as it holds on to memory even with cache=False.
+    Cached frames are shared, callers must not modify them in place.
+    """
+
+    def __init__(self, max_bytes: int = 0) -> None:
+        """
+        Parameters:
+            max_bytes (int): Memory budget in bytes, 0 disables caching.
+        """
+        self.max_bytes = max_bytes
+        self._frames = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def configure(self, max_bytes: int) -> None:
+        """Change the memory budget, evicting entries if it shrank."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(
+        self, key: Tuple, max_age: Optional[float] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Parameters:
+            max_age (float): Seconds an entry is trusted, None for ever.
+
+        Returns:
+            The cached frame for key, or None.
+        """
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and max_age is not None:
+                if time.time() - entry[2] >= max_age:
+                    del self._frames[key]
+                    self._bytes -= entry[1]
+                    entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._frames.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key: Tuple, fr: pd.DataFrame) -> None:
+        """Cache fr under key, unless it is bigger than the whole budget."""
+        nbytes = int(fr.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if key in self._frames:
+                self._bytes -= self._frames.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._frames[key] = (fr, nbytes, time.time())
+            self._bytes += nbytes
+            self._evict()
+
+    def _evict(self) -> None:
+        # Called with the lock held
+        while self._bytes > self.max_bytes and self._frames:
+            _, (_, nbytes, _) = self._frames.popitem(last=False)
+            self._bytes -= nbytes
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            A dict with the hits, misses and evictions so far, and the
+            number of entries and bytes cached now.
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._frames), bytes=self._bytes)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the stats."""
+        with self._lock:
+            self._frames = OrderedDict()
+            self._bytes = 0
+            self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+# Shared by every CloudCatalog in this process
+frame_cache = FrameCache()
+
+
+class MissingIndexCache:
+    """
+    Remembers year indices that do not exist, so requests over datasets
+    with gaps do not run the whole fetch_S3orURL cascade for every
+    missing year, every time. A record holds until it is older than the
+    TTL, or the catalog entry's modification time changes (a new version
+    of the dataset may fill the gap).
+    """
+
+    def __init__(self, ttl: float = 3600.0) -> None:
+        """
+        Parameters:
+            ttl (float): Seconds a missing index is trusted to stay
+                         missing, 0 disables the cache.
+        """
+        self.ttl = ttl
+        self._records = {}
+        self._stats = {"hits": 0}
+        self._lock = threading.Lock()
+
+    def configure(self, ttl: float) -> None:
+        """Change the TTL, applies to existing records too."""
+        with self._lock:
+            self.ttl = ttl
+
+    def is_missing(self, url: str, version: Optional[str] = None) -> bool:
+        """
+        True if url was recorded missing, under the same version, less
+        than ttl seconds ago.
+        """
+        with self._lock:
+            record = self._records.get(url)
+            if record is None:
+                return False
+            if record[1] != version or time.time() - record[0] >= self.ttl:
+                del self._records[url]
+                return False
+            self._stats["hits"] += 1
+            return True
 
-    response = s3_client.get_object(Bucket=mybucket, Key=mykey)
-    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
-    # print("  Success S3 unsigned",status)
-    if "Body" in response and status == 200:
-        catalog_bytes = response["Body"].read()
-        if rawbytes:
-            catalog = catalog_bytes
-        else:
-            catalog = json.loads(catalog_bytes)
-    elif status != 200:
-        print("Error, status = ", status)
-    return status, catalog
+    def record(self, url: str, version: Optional[str] = None, when=None) -> None:
+        """
+        Remember that url is missing, as of when (a time.time(), default
+        now) and for this version of its catalog entry.
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._records[url] = (time.time() if when is None else when, version)
 
+    def discard(self, url: str) -> None:
+        """Forget a record, e.g. once the index turned up."""
+        with self._lock:
+            self._records.pop(url, None)
 
-def fetch_url(s3url, rawbytes=False):
-    # default is JSON, but can return raw bytes
-    httpurl = s3url_to_https(s3url)
-    response = requests.get(httpurl)
-    status = response.status_code
-    if rawbytes:
-        catalog = response.content
-    else:
-        catalog = response.json()
-    return status, catalog
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            A dict with the number of fetches skipped so far and the
+            number of indices recorded missing now.
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._records))
 
+    def clear(self) -> None:
+        """Forget all records and reset the stats."""
+        with self._lock:
+            self._records = {}
+            self._stats = {"hits": 0}
 
-def fetch_S3orURL(s3url, region="us-east-1", rawbytes=False, **client_kwargs):
-    """To get around vagualities of S3 access, this tries a cascade of:
-    straight fetch of S3 using your existing permissions
-    fetch S3 unsigned/anonymous
-    fetch S3 for a specified region only, defaulting to us-east-1
-    fetch the S3 contents via the AWS-equivalent URL
-    """
 
-    try:
-        # print("Calling unsigned")
-        status, catalog = fetch_S3(
-            s3url, unsigned=True, rawbytes=rawbytes, **client_kwargs
-        )
-    except:
-        try:
-            # print("Calling signed")
-            status, catalog = fetch_S3(
-                s3url, unsigned=False, rawbytes=rawbytes, **client_kwargs
-            )
-        except:
-            try:
-                # print("Calling region")
-                status, catalog = fetch_S3(
-                    s3url,
-                    unsigned=True,
-                    region=region,
-                    rawbytes=rawbytes,
-                    **client_kwargs,
-                )
-            except:
-                try:
-                    # print("Calling url")
-                    status, catalog = fetch_url(s3url, rawbytes=rawbytes)
-                    if status == 404:
-                        return None
-                except:
-                    # print("Cannot fetch catalog, exiting.")
-                    return None
-    if rawbytes:
-        fr_bytes_file = BytesIO()
-        fr_bytes_file.write(catalog)
-        fr_bytes_file.seek(0)
-        return fr_bytes_file
-    else:
-        return catalog
+# Shared by every CloudCatalog in this process
+missing_index_cache = MissingIndexCache()
 
 
 class CatalogRegistry:
     """Use to work with the the global catalog (catalog of catalogs)."""
 
-    def __init__(self, catalog_url: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        catalog_url: Optional[str] = None,
+        catalog: Optional[Dict] = None,
+        session_pool: Optional[HTTPSessionPool] = None,
+    ) -> None:
         """
         Parameters:
             catalog_url: either the environment variable
                          `ROOT_CATALOG_REGISTRY_URL` if it exists
                          or the smce heliocloud global catalog by default,
                          otherwise the explicitly passed in url.
+            catalog: the global catalog if it was already fetched from
+                         catalog_url, skips the download.
+            session_pool: HTTPSessionPool to download with, else the
+                         shared http_session_pool.
         """
-        # Set the catalog URL (env variable or default if not manually provided)
-        if catalog_url is None:
-            catalog_url = os.getenv("ROOT_CATALOG_REGISTRY_URL")
-            if catalog_url is None:
-                catalog_url = "http://heliocloud.org/catalog/HelioDataRegistry.json"
-        self.catalog_url = catalog_url
+        self.catalog_url = self.resolve_url(catalog_url)
 
         # Load the content from json
-        response = requests.get(self.catalog_url)
-        if response.status_code == 200:
-            self.catalog = response.json()
-        else:
-            raise requests.ConnectionError(
-                f"Get Request for Global Catalog Failed. Catalog url: {self.catalog_url}"
-            )
+        if catalog is None:
+            if session_pool is None:
+                session_pool = http_session_pool
+            response = session_pool.get(self.catalog_url)
+            if response.status_code == 200:
+                catalog = response.json()
+            else:
+                raise requests.ConnectionError(
+                    f"Get Request for Global Catalog Failed. Catalog url: {self.catalog_url}"
+                )
+        self.catalog = catalog
 
         # Check global catalog format assumptions
         if "registry" not in self.catalog:
@@ -210,6 +1823,20 @@ class CatalogRegistry:
                     f"Invalid registry entry in catalog. Missing endpoint or name or region key. Registry entry: {reg_entry}"
                 )
 
+    @staticmethod
+    def resolve_url(catalog_url: Optional[str] = None) -> str:
+        """
+        The global catalog URL to use: catalog_url if given, else the
+        environment variable `ROOT_CATALOG_REGISTRY_URL` if it exists,
+        else the heliocloud global catalog.
+        """
+        # Set the catalog URL (env variable or default if not manually provided)
+        if catalog_url is None:
+            catalog_url = os.getenv("ROOT_CATALOG_REGISTRY_URL")
+            if catalog_url is None:
+                catalog_url = "http://heliocloud.org/catalog/HelioDataRegistry.json"
+        return catalog_url
+
     def get_catalog(self) -> Dict:
         """
         Get the global catalog with all metadata and registry entries.
@@ -317,6 +1944,12 @@ class CloudCatalog:
         bucket_name: str,
         cache_folder: Optional[str] = None,
         cache: bool = False,
+        max_pool_connections: Optional[int] = None,
+        http_options: Optional[Dict] = None,
+        retry_options: Optional[Dict] = None,
+        cache_format: str = "csv",
+        cache_ttl: Optional[float] = 86400.0,
+        engine: str = "pandas",
         **client_kwargs,
     ) -> None:
         """
@@ -328,10 +1961,69 @@ class CloudCatalog:
                   should be cached so that S3 pulling
                   is not unnecessarily done. If a cache_folder is provided,
                   this is forced to false because some archives
-                  e.g. CDAWeb updates frequently.
+                  e.g. CDAWeb updates frequently. When caching, the
+                  access method that works for each bucket is also
+                  remembered in the cache folder.
+            max_pool_connections (optional, int): Connection pool size of
+                  the S3 clients this catalog fetches with, raise it when
+                  fetching many years concurrently. Catalogs asking for
+                  the same size share clients, other catalogs are not
+                  affected.
+            http_options (optional, dict): HTTP session settings for
+                  the https access of this catalog, see
+                  HTTPSessionPool.configure (pool_maxsize,
+                  host_pool_sizes, compress). Catalogs with the same
+                  options share a session, the shared
+                  http_session_pool is left as is.
+            retry_options (optional, dict): Retry settings for the
+                  fetches of this catalog, see RetryPolicy (max_attempts,
+                  backoff, timeout, hedge, etc.). Catalogs with the same
+                  options share a policy, the shared retry_policy is
+                  left as is.
+            cache_format (optional, str): "csv" caches the downloaded
+                  index files only. "feather" also caches each parsed
+                  year as an uncompressed Feather file that is read back
+                  memory-mapped, skipping the parse (needs pyarrow).
+            cache_ttl (optional, float): Cached index files are checked
+                  again (with a conditional request) when their catalog
+                  entry's modification time changes. For entries without
+                  one, they are checked once older than this many
+                  seconds, None trusts them forever.
+            engine (optional, str): CSV parser for the index files,
+                  "pandas" or "pyarrow" (multithreaded, much faster on
+                  big years). Falls back to pandas if pyarrow is not
+                  installed, the columns come out the same either way.
             client_kwargs: parameters for boto3.client:
                    region_name, aws_acces_key_id, aws_secret_access_key, etc.
         """
+        self._configure(
+            bucket_name,
+            cache,
+            max_pool_connections,
+            http_options,
+            client_kwargs,
+            retry_options,
+            cache_format,
+            cache_ttl,
+            engine,
+        )
+        catalog = fetch_S3orURL(
+            self.bucket_name + "/catalog.json", **client_kwargs, **self.fetch_options
+        )
+        self._load_catalog(catalog, cache_folder)
+
+    def _configure(
+        self,
+        bucket_name: str,
+        cache: bool,
+        max_pool_connections: Optional[int],
+        http_options: Optional[Dict],
+        client_kwargs: Dict,
+        retry_options: Optional[Dict] = None,
+        cache_format: str = "csv",
+        cache_ttl: Optional[float] = 86400.0,
+        engine: str = "pandas",
+    ) -> None:
         # Remove s3 uri info if provided
         bucket_prefix = "s3://"
         if bucket_name.startswith(bucket_prefix):
@@ -342,8 +2034,41 @@ class CloudCatalog:
         self.bucket_name = bucket_name
 
         self.cache = cache
+        if cache_format not in ("csv", "feather"):
+            raise ValueError(f"cache_format must be csv or feather, not {cache_format}")
+        if cache_format == "feather":
+            _import_pyarrow("pyarrow.feather", "The feather cache_format")
+        self.cache_format = cache_format
+        self.cache_ttl = cache_ttl
+        if engine not in ("pandas", "pyarrow"):
+            raise ValueError(f"engine must be pandas or pyarrow, not {engine}")
+        if engine == "pyarrow":
+            try:
+                _import_pyarrow("pyarrow.csv", "The pyarrow engine")
+            except ImportError as e:
+                logging.info(f"{e} Using the pandas engine.")
+                engine = "pandas"
+        self.engine = engine
 
-        self.catalog = fetch_S3orURL(bucket_name + "/catalog.json", **client_kwargs)
+        # Passed down to every fetch of this catalog, with client_kwargs
+        self.fetch_options = {}
+        # S3 clients are shared, so this selects the client rather than build one
+        if max_pool_connections is not None:
+            self.fetch_options["max_pool_connections"] = max_pool_connections
+        if http_options is not None:
+            self.fetch_options["session_pool"] = http_session_pool.variant(
+                **http_options
+            )
+        if retry_options is not None:
+            self.fetch_options["policy"] = retry_policy.variant(**retry_options)
+        self.client_kwargs = client_kwargs
+
+    def _load_catalog(self, catalog: Optional[Dict], cache_folder: Optional[str]):
+        """Check the fetched catalog.json and set up the cache folder."""
+        bucket_prefix = "s3://"
+        self.catalog = catalog
+        # Versions cached files of entries without a modification time
+        self.catalog_fetched = time.time()
 
         if self.catalog == None:
             raise KeyError(f"Invalid catalog, does not Exist. Catalog: {self.catalog}")
@@ -381,7 +2106,7 @@ class CloudCatalog:
 
         # Set and create the folder for caching
         self.cache_folder = None
-        if cache:
+        if self.cache:
             if cache_folder is None:
                 cache_folder = self.bucket_name + "_cache"
             self.cache_folder = cache_folder
@@ -392,6 +2117,11 @@ class CloudCatalog:
             with open(os.path.join(cache_folder, "catalog.json"), "w") as file:
                 json.dump(self.catalog, file, indent=4, ensure_ascii=False)
 
+            # Keep the working access method per bucket across sessions
+            access_strategy_cache.load(
+                os.path.join(cache_folder, "access_strategy.json")
+            )
+
     def get_catalog(self) -> Dict:
         """
         Gets the raw catalog downloaded from the bucket.
@@ -469,13 +2199,75 @@ class CloudCatalog:
                 year_start_date = min(catalog_year_start_date, start_date.year)
         return year_start_date
 
+    def _spec_version(self) -> float:
+        """
+        The spec version of the bucket's catalog.json, from its "Cloudy"
+        key, or "version" for catalogs without one.
+        """
+        # print("Debug, version is ",self.catalog["Cloudy"])
+        try:
+            return float(self.catalog["Cloudy"])
+        except (KeyError, ValueError, TypeError):
+            return float(self.catalog["version"])
+
+    def _normalize_index(self, fr: pd.DataFrame) -> pd.DataFrame:
+        """
+        Make the columns of one parsed index file follow the current spec:
+        start, stop, datakey and filesize first, whatever the file used.
+        """
+        if self._spec_version() < 0.5:
+            # spec before 0.5 was start/key/filesize
+            # generate a 'maybe' stop using start time of prior entry
+            col0 = fr.columns[0]
+            try:
+                fr.insert(1, "stop", fr[col0].shift(-1))
+            except:
+                pass  # usually because 'stop' already exists in metadata
+
+        # Handle # if used for the header
+        if fr.columns.values[0][:2] == "# ":
+            fr.columns.values[0] = fr.columns.values[0][2:]
+
+        # Make column names consistent since not enforcing this spec
+        fr.rename(
+            columns={
+                "start": "start",
+                "stop": "stop",
+                "modification": "modification",
+            },
+            inplace=True,
+        )
+
+        """ assume first column is start, second is stop, third is key,
+            and fourth is filesize
+            only assuming if not found in column names
+            no error will be thrown if one of these missing,
+            but per spec they are required """
+        if "start" not in fr.columns.values:
+            fr.columns.values[0] = "start"
+        if "stop" not in fr.columns.values:
+            fr.columns.values[1] = "stop"
+        if "datakey" not in fr.columns.values:
+            fr.columns.values[2] = "datakey"
+        if "filesize" not in fr.columns.values:
+            fr.columns.values[3] = "filesize"
+        return fr
+
     def request_cloud_catalog(
         self,
         catalog_id: str,
         start_date: Optional[str] = None,
         stop_date: Optional[str] = None,
         overwrite: bool = False,
-    ) -> pd.DataFrame:
+        range_read: bool = False,
+        range_lookback: timedelta = timedelta(days=1),
+        revalidate: bool = False,
+        max_workers: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        compact: bool = False,
+        backend: str = "pandas",
+    ):
         """
         Request the files in the dataset catalog within the provided times
         from the s3 bucket.
@@ -488,11 +2280,605 @@ class CloudCatalog:
                               (default None). ISO 8601 standard.
             overwrite (bool): Overwrite files already cached if within request
                               cache in initilization must have been true.
+            range_read (bool): Fetch only the part of each year index
+                              covering the request, found by a binary
+                              search with byte-range requests. Falls back
+                              to the whole file if the server does not
+                              support ranges. Cached files are still used,
+                              but partial files are not cached. Plain csv
+                              indices only.
+            range_lookback (timedelta): How long before start_date a file
+                              may begin and still overlap it, i.e. the
+                              longest file duration. Bounds what range_read
+                              fetches, and the rows the time filter checks
+                              (longer files are still found, just slower).
+            revalidate (bool): Check cached files are still current with a
+                              conditional request (ETag/Last-Modified), so
+                              only changed files are downloaded again.
+            max_workers (int, optional): Fetch and parse up to this many
+                              year files at once in a thread pool. By
+                              default they are done one at a time.
+            columns (list, optional): Only return these columns, e.g.
+                              ["start", "datakey"]. Only these (plus start
+                              and stop, for the time filter) are parsed
+                              from each index file.
+            dtypes (dict, optional): Column dtypes to parse with, e.g.
+                              {"filesize": "int32", "quality": "category"}.
+                              filesize defaults to int64, other columns
+                              are inferred. start and stop are always
+                              datetime64.
+            compact (bool): Return the datakeys as a categorical folder
+                              prefix plus the file name, see
+                              compact_datakeys. Saves most of their memory
+                              on big listings.
+            backend (str): The type of the result: "pandas", "arrow" (a
+                              pyarrow Table), "polars" (a polars
+                              DataFrame) or "numpy" (a structured array),
+                              see to_backend.
 
         Returns:
-            A pandas Dataframe containing the requested dataset catalog.
+            A pandas Dataframe containing the requested dataset catalog,
+            or the backend's equivalent.
+        """
+        _check_backend(backend)
+        start_date, stop_date, files = self._plan_request(
+            catalog_id, start_date, stop_date
+        )
+
+        def read_year(year_file):
+            url, filepath = year_file
+            return self._read_year(
+                url,
+                filepath,
+                start_date,
+                stop_date,
+                overwrite,
+                range_read,
+                range_lookback,
+                revalidate,
+                columns,
+                dtypes,
+                self._frame_key(catalog_id, url, columns, dtypes),
+            )
+
+        # Years are read in order, or concurrently with map keeping the order
+        if max_workers is None or max_workers <= 1 or len(files) <= 1:
+            frs = [read_year(year_file) for year_file in files]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(files)),
+                thread_name_prefix="cloudcatalog",
+            ) as executor:
+                frs = list(executor.map(read_year, files))
+
+        frs = [fr for fr in frs if fr is not None]
+        fr = self._finish_request(frs, columns)
+        if compact:
+            fr = compact_datakeys(fr)
+        return to_backend(fr, backend)
+
+    def request_cloud_catalogs(
+        self,
+        queries: List[Tuple[str, Optional[str], Optional[str]]],
+        concat: bool = False,
+        overwrite: bool = False,
+        revalidate: bool = False,
+        max_workers: Optional[int] = 8,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        compact: bool = False,
+        backend: str = "pandas",
+    ) -> Union[Dict, pd.DataFrame]:
+        """
+        Request the files of many datasets and time windows at once. Each
+        year index is fetched and parsed only once however many requests
+        need it, and the year indices are read concurrently.
+
+        Parameters:
+            queries (list): Tuples of (catalog_id, start_date, stop_date),
+                             as for request_cloud_catalog. An id may come
+                             with several windows.
+            concat (bool): Return one long-format DataFrame, with the
+                           catalog_id of each row in an "id" column,
+                           instead of a dict.
+            overwrite (bool): See request_cloud_catalog.
+            revalidate (bool): See request_cloud_catalog.
+            max_workers (int, optional): Year indices read in parallel,
+                           None or 1 reads them one after another.
+            columns (list, optional): See request_cloud_catalog.
+            dtypes (dict, optional): See request_cloud_catalog.
+            compact (bool): See request_cloud_catalog.
+            backend (str): See request_cloud_catalog.
+
+        Returns:
+            A dict of the files of each catalog_id (in the order first
+            requested), the rows in any of its windows in time order, or
+            with concat, those frames one after the other.
+        """
+        _check_backend(backend)
+        # Plan everything first so each year index is read once
+        windows = {}
+        id_files = {}
+        spans = {}
+        for catalog_id, start_date, stop_date in queries:
+            start_date, stop_date, files = self._plan_request(
+                catalog_id, start_date, stop_date
+            )
+            windows.setdefault(catalog_id, []).append((start_date, stop_date))
+            id_files.setdefault(catalog_id, {}).update(dict.fromkeys(files))
+            for year_file in files:
+                span = spans.get(year_file, (catalog_id, start_date, stop_date))
+                spans[year_file] = (
+                    catalog_id,
+                    min(span[1], start_date),
+                    max(span[2], stop_date),
+                )
+
+        def read_year(year_file):
+            url, filepath = year_file
+            # The whole span any request needs, for Parquet row group pruning
+            catalog_id, start_date, stop_date = spans[year_file]
+            frame_key = self._frame_key(catalog_id, url, columns, dtypes)
+            source = self._fetch_year(
+                url,
+                filepath,
+                start_date,
+                stop_date,
+                overwrite=overwrite,
+                revalidate=revalidate,
+                columns=columns,
+                dtypes=dtypes,
+                frame_key=frame_key,
+            )
+            if source is None:
+                return None
+            (fr,) = self._iter_year(source, columns, dtypes, frame_key=frame_key)
+            # Filtered in the worker, so only the wanted rows of each year
+            # are held until the batch is done, copied so a slice does not
+            # keep the whole year alive
+            return self._filter_windows(fr, windows[catalog_id], columns).copy()
+
+        year_files = list(spans)
+        if max_workers is None or max_workers <= 1 or len(year_files) <= 1:
+            years = [read_year(year_file) for year_file in year_files]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(year_files)),
+                thread_name_prefix="cloudcatalog",
+            ) as executor:
+                years = list(executor.map(read_year, year_files))
+        years = dict(zip(year_files, years))
+
+        results = {}
+        for catalog_id, files in id_files.items():
+            # Year files sort by year, all share the id's index location
+            frs = [
+                years[year_file]
+                for year_file in sorted(files)
+                if years[year_file] is not None
+            ]
+            results[catalog_id] = self._finish_request(frs, columns)
+        if not concat:
+            if compact:
+                results = {key: compact_datakeys(fr) for key, fr in results.items()}
+            return {key: to_backend(fr, backend) for key, fr in results.items()}
+
+        ids = pd.Categorical(
+            np.repeat(list(results), [len(fr) for fr in results.values()]),
+            categories=list(results),
+        )
+        fr = pd.concat(list(results.values()) or [self._finish_request([], columns)])
+        fr.insert(0, "id", ids)
+        if compact:
+            fr = compact_datakeys(fr)
+        return to_backend(fr, backend)
+
+    def iter_cloud_catalog(
+        self,
+        catalog_id: str,
+        start_date: Optional[str] = None,
+        stop_date: Optional[str] = None,
+        chunksize: Optional[int] = None,
+        overwrite: bool = False,
+        range_read: bool = False,
+        range_lookback: timedelta = timedelta(days=1),
+        revalidate: bool = False,
+        max_workers: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        backend: str = "pandas",
+    ) -> Iterator:
+        """
+        Like request_cloud_catalog, but yields the requested dataset catalog
+        piece by piece instead of building one DataFrame, so processing can
+        start on the first year while later ones download and only one
+        piece is held in memory at a time.
+
+        Parameters:
+            catalog_id (str): The id of the catalog entry in the s3 bucket.
+            start_date (str): Start date for which files are needed
+                              (default None). ISO 8601 standard.
+            stop_date (str): End date for which files are needed
+                              (default None). ISO 8601 standard.
+            chunksize (int, optional): Parse each year index this many rows
+                              at a time and yield them separately. By
+                              default each year is yielded whole.
+            max_workers (int, optional): Download up to this many year
+                              files ahead of the one being yielded.
+            Other parameters as for request_cloud_catalog.
+
+        Yields:
+            Time filtered pandas DataFrames (or the backend's equivalent),
+            in time order. Years or chunks without matching rows are
+            skipped; at most chunksize rows each.
+        """
+        _check_backend(backend)
+        start_date, stop_date, files = self._plan_request(
+            catalog_id, start_date, stop_date
+        )
+
+        def fetch_year(year_file):
+            url, filepath = year_file
+            frame_key = self._frame_key(catalog_id, url, columns, dtypes)
+            source = self._fetch_year(
+                url,
+                filepath,
+                start_date,
+                stop_date,
+                overwrite,
+                range_read,
+                range_lookback,
+                revalidate,
+                columns,
+                dtypes,
+                frame_key,
+            )
+            return source, frame_key
+
+        for source, frame_key in self._prefetch(fetch_year, files, max_workers):
+            if source is None:
+                continue
+            # Chunked parses are not cached, they would not bound memory
+            if chunksize is not None or range_read:
+                frame_key = None
+            frames = self._iter_year(source, columns, dtypes, chunksize, frame_key)
+            for fr in frames:
+                fr = self._filter_dates(
+                    fr, start_date, stop_date, columns, range_lookback
+                )
+                if len(fr):
+                    yield to_backend(fr, backend)
+
+    @staticmethod
+    def _prefetch(
+        func: Callable,
+        items: Iterable,
+        max_workers: Optional[int],
+        ordered: bool = True,
+        discard: Optional[Callable] = None,
+        ahead: Optional[int] = None,
+    ) -> Iterator:
+        """
+        Yield func(item) for each item, in order or, if not ordered, as
+        the calls complete. With max_workers, up to that many calls run
+        ahead in a thread pool, else each runs when its result is asked
+        for. ahead sets how many calls run (or wait to be yielded) ahead
+        of the consumer separately, on max_workers threads (default 1).
+        If the consumer stops early, calls not started are cancelled
+        and discard is called with the results of those that finished
+        but were never yielded (e.g. to close them).
+        """
+        workers = max_workers or 1
+        window = workers if ahead is None else ahead
+        if window < 1 or (ahead is None and workers <= 1):
+            for item in items:
+                yield func(item)
+            return
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="cloudcatalog"
+        ) as executor:
+            pending = deque() if ordered else set()
+            ready = deque()
+
+            def next_done():
+                nonlocal pending
+                if ordered:
+                    return pending.popleft()
+                if not ready:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    ready.extend(done)
+                return ready.popleft()
+
+            try:
+                for item in items:
+                    future = executor.submit(func, item)
+                    if ordered:
+                        pending.append(future)
+                    else:
+                        pending.add(future)
+                    if len(pending) + len(ready) > window:
+                        yield next_done().result()
+                while pending or ready:
+                    yield next_done().result()
+            finally:
+                # The consumer stopped early, do not download the rest
+                for future in [*ready, *pending]:
+                    if not future.cancel() and discard is not None:
+                        future.add_done_callback(
+                            lambda done: done.exception() or discard(done.result())
+                        )
+
+    def _read_year(
+        self,
+        url: str,
+        filepath: Optional[str],
+        start_date: datetime,
+        stop_date: datetime,
+        overwrite: bool = False,
+        range_read: bool = False,
+        range_lookback: timedelta = timedelta(days=1),
+        revalidate: bool = False,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        frame_key: Optional[Tuple] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch and parse one year index, see request_cloud_catalog. Safe to
+        run for several years at once, each has its own cache file and
+        cache files are replaced atomically. With a frame_key, the parsed
+        year is looked up in and added to frame_cache.
+
+        Returns:
+            The year index filtered to the requested dates, or None if it
+            does not exist.
+        """
+        source = self._fetch_year(
+            url,
+            filepath,
+            start_date,
+            stop_date,
+            overwrite,
+            range_read,
+            range_lookback,
+            revalidate,
+            columns,
+            dtypes,
+            frame_key,
+        )
+        if source is None:
+            return None
+        # Partial (range read) years must not be cached as the whole year
+        if range_read:
+            frame_key = None
+        # Filter each year as it is read, so unneeded rows are never concatenated
+        (fr,) = self._iter_year(source, columns, dtypes, frame_key=frame_key)
+        return self._filter_dates(fr, start_date, stop_date, columns, range_lookback)
+
+    def _fetch_year(
+        self,
+        url: str,
+        filepath: Optional[str],
+        start_date: datetime,
+        stop_date: datetime,
+        overwrite: bool = False,
+        range_read: bool = False,
+        range_lookback: timedelta = timedelta(days=1),
+        revalidate: bool = False,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        frame_key: Optional[Tuple] = None,
+    ) -> Union[BytesIO, str, pd.DataFrame, None]:
+        """
+        Fetch one year index, see request_cloud_catalog.
+
+        Returns:
+            The content or cache file path of a csv index, to be parsed
+            with _iter_year, a DataFrame if the year is in frame_cache
+            (under frame_key) or is a Parquet index (which is parsed as it
+            is read), or None if the index does not exist.
+        """
+        if self._known_missing(url, filepath, overwrite):
+            return None
+
+        cached_fr = None
+        if frame_key is not None and not overwrite:
+            # Like cached files without a modification time, entries
+            # expire after cache_ttl, this process never rereads the entry
+            cached_fr = frame_cache.get(frame_key, max_age=self.cache_ttl)
+            if cached_fr is not None and not revalidate:
+                return cached_fr
+
+        if url.endswith(".parquet"):
+            fr = self._read_parquet_year(
+                url, filepath, start_date, stop_date, overwrite, revalidate, columns
+            )
+            if fr is not None and dtypes:
+                fr = fr.astype({k: v for k, v in dtypes.items() if k in fr.columns})
+            return fr
+
+        # Compressed indices cannot be binary searched, they are read whole
+        range_read = range_read and url.endswith(".csv")
+        typed = self.cache_format == "feather" and filepath is not None
+        if typed and not (range_read and not self._use_cached(filepath, overwrite)):
+            fr, changed = self._fetch_typed_year(
+                url, filepath, overwrite, revalidate, columns, dtypes
+            )
+            if cached_fr is not None and fr is not None and not changed:
+                return cached_fr
+            return fr
+
+        if range_read and not self._use_cached(filepath, overwrite):
+            # Only part of the file is fetched, so it is not cached
+            info = {}
+            fr_bytes_file = fetch_index_slice(
+                url,
+                start_date,
+                stop_date,
+                lookback=range_lookback,
+                info=info,
+                **self.client_kwargs,
+                **self.fetch_options,
+            )
+            if info.get("status") == 404:
+                self._record_missing(url, filepath)
+        else:
+            fr_bytes_file = self._fetch_index_file(url, filepath, overwrite, revalidate)
+        if cached_fr is not None and fr_bytes_file == filepath:
+            # Revalidated, the cache file and so the parsed year are current
+            return cached_fr
+        return fr_bytes_file
+
+    def _fetch_typed_year(
+        self,
+        url: str,
+        filepath: str,
+        overwrite: bool = False,
+        revalidate: bool = False,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+    ) -> Tuple[Optional[pd.DataFrame], bool]:
+        """
+        _fetch_year with cache_format "feather": the parsed year is read
+        memory-mapped from its Feather copy if that is current, otherwise
+        the index is fetched (or read from the cache folder) and parsed,
+        and the Feather copy written.
+
+        Returns:
+            The parsed year, or None if the index does not exist, and
+            whether it was parsed anew rather than read from the Feather
+            copy.
+        """
+        typed_path = filepath + ".feather"
+        fr = None
+        if self._has_cached(filepath, overwrite) and os.path.exists(typed_path):
+            if os.path.getmtime(typed_path) >= os.path.getmtime(filepath):
+                fr = self._read_typed_cache(typed_path, columns, dtypes)
+        if fr is not None and not revalidate and self._cache_is_current(filepath):
+            return fr, False
+
+        fr_bytes_file = self._fetch_index_file(url, filepath, overwrite, revalidate)
+        if fr_bytes_file is None:
+            return None, True
+        if fr is not None and fr_bytes_file == filepath:
+            # Revalidated, the index is unchanged
+            return fr, False
+
+        # The whole year is parsed for the cache, columns are picked later
+        fr = self._parse_index_file(fr_bytes_file)
+        self._write_typed_cache(typed_path, fr)
+        if dtypes:
+            fr = fr.astype({k: v for k, v in dtypes.items() if k in fr.columns})
+        return fr, True
+
+    @staticmethod
+    def _read_typed_cache(
+        typed_path: str,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Read a Feather copy of a parsed year, memory-mapped so pages are
+        shared with other processes reading it, or None if unreadable.
+        """
+        feather = _import_pyarrow("pyarrow.feather", "The feather cache_format")
+        try:
+            table = feather.read_table(typed_path, memory_map=True)
+        except (OSError, ValueError) as e:
+            logging.debug(f"Ignoring unreadable cache file {typed_path}: {e}")
+            return None
+        if columns is not None:
+            wanted = {"start", "stop"}.union(columns)
+            table = table.select(
+                [name for name in table.schema.names if name in wanted]
+            )
+        fr = table.to_pandas(split_blocks=True)
+        if dtypes:
+            fr = fr.astype({k: v for k, v in dtypes.items() if k in fr.columns})
+        return fr
+
+    @staticmethod
+    def _write_typed_cache(typed_path: str, fr: pd.DataFrame) -> None:
+        """Save a parsed year as an uncompressed (mappable) Feather file."""
+        feather = _import_pyarrow("pyarrow.feather", "The feather cache_format")
+        try:
+            _atomic_write(
+                typed_path,
+                lambda path: feather.write_feather(
+                    fr, path, compression="uncompressed"
+                ),
+            )
+        except (OSError, ValueError, TypeError) as e:
+            # e.g. a column pyarrow cannot convert, the csv cache still works
+            logging.debug(f"Could not write cache file {typed_path}: {e}")
+
+    def _frame_key(
+        self,
+        catalog_id: str,
+        url: str,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+    ) -> Optional[Tuple]:
         """
+        The frame_cache key of a parsed year index: bucket, id, year and
+        version (the entry's modification time), plus the parse options.
+        None for Parquet indices, which are only read in part.
+        """
+        if url.endswith(".parquet") or frame_cache.max_bytes <= 0:
+            return None
+        match = re.search(r"_(\d{4})\.csv(\.zip)?$", url)
+        year = match.group(1) if match else url
+        # Without a modification time, a fresh catalog.json is a new version
+        version = self.get_entry(catalog_id).get("modification")
+        if not version:
+            version = self.catalog_fetched
+        options = (
+            None if columns is None else tuple(columns),
+            None
+            if dtypes is None
+            else tuple(sorted((k, str(v)) for k, v in dtypes.items())),
+        )
+        return (self.bucket_name, catalog_id, year, version) + options
+
+    def _iter_year(
+        self,
+        source: Union[BytesIO, str, pd.DataFrame],
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        chunksize: Optional[int] = None,
+        frame_key: Optional[Tuple] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Parse a year index fetched by _fetch_year, adding it to
+        frame_cache under frame_key if given (without chunksize).
+
+        Yields:
+            The whole year, or pieces of chunksize rows.
+        """
+        if not isinstance(source, pd.DataFrame):
+            for fr in self._iter_index_file(source, columns, dtypes, chunksize):
+                if frame_key is not None and chunksize is None:
+                    frame_cache.put(frame_key, fr)
+                yield fr
+        elif chunksize is None:
+            yield source
+        else:
+            for first in range(0, len(source), chunksize):
+                yield source.iloc[first : first + chunksize]
 
+    def _plan_request(
+        self,
+        catalog_id: str,
+        start_date: Optional[str],
+        stop_date: Optional[str],
+    ) -> Tuple[datetime, datetime, List[Tuple[str, Optional[str]]]]:
+        """
+        Work out which year index files a request needs.
+
+        Returns:
+            The parsed start and stop dates and, for each year in order,
+            a tuple of the index URL and the cache file path (None when
+            not caching).
+        """
         # everything else assumes typical time series data
 
         start_date = self.date2datetime(start_date)
@@ -526,187 +2912,674 @@ class CloudCatalog:
             entry["start"],
             entry["stop"],
         )
-        ndxformat = "csv"  # entry['ndxformat']
+        # csv unless the entry says otherwise
+        ndxformat = {"parquet": "parquet", "csv-zip": "csv.zip"}.get(
+            str(entry.get("indextype", "csv")).lower(), "csv"
+        )
+
+        # If caching
+        if self.cache_folder is None:
+            path = None
+        else:
+            # Create the path for storing cached files and folder if not exist
+            path = os.path.join(self.cache_folder, catalog_id)
+            os.makedirs(path, exist_ok=True)
+
+        # Compute minimum and maximum year from start and end date respectively
+        year_start_date = self.year_range(
+            catalog_start_date, start_date, direction="max"
+        )
+        year_stop_date = self.year_range(catalog_stop_date, stop_date, direction="min")
+
+        # Local or different: Could be same bucket or different bucket
+        # not enforcing being same bucket
+        # allowing https addition
+        if not loc.startswith("http"):
+            bucket_name = loc[5:].split("/", 1)[0]
+            loc = bucket_name + "/" + loc[len(bucket_name) + 6 :]
+
+        files = []
+        for year in range(year_start_date, year_stop_date + 1):
+            filename = f"{eid}_{year}.{ndxformat}"
+            filepath = None if path is None else os.path.join(path, filename)
+            files.append((loc + filename, filepath))
+        return start_date, stop_date, files
+
+    def _use_cached(self, filepath: Optional[str], overwrite: bool) -> bool:
+        """True if a year index should be read from the cache folder."""
+        return self._has_cached(filepath, overwrite) and self._cache_is_current(
+            filepath
+        )
+
+    def _has_cached(self, filepath: Optional[str], overwrite: bool) -> bool:
+        """True if a year index is in the cache folder, current or not."""
+        return (
+            self.cache
+            and not overwrite
+            and filepath is not None
+            and os.path.exists(filepath)
+        )
+
+    def _cache_is_current(self, filepath: str) -> bool:
+        """
+        Whether a cached year index can be used without asking the server.
+        It can if it was cached under the entry's current modification
+        time, or for entries without one, if it is younger than cache_ttl.
+        """
+        meta = self._read_cache_meta(filepath)
+        modification = self._entry_modification(filepath)
+        if modification:
+            return meta.get("modification") == modification
+        if self.cache_ttl is None:
+            return True
+        fetched = meta.get("fetched") or os.path.getmtime(filepath)
+        return time.time() - fetched < self.cache_ttl
+
+    def _entry_modification(self, path: str) -> Optional[str]:
+        """
+        The modification time of the catalog entry a year index (URL or
+        cache file path, named <id>_YYYY.<ext>) belongs to, if it has one.
+        """
+        catalog_id = os.path.basename(path).rsplit("_", 1)[0]
+        try:
+            return self.get_entry(catalog_id).get("modification")
+        except (KeyError, ValueError):
+            return None
+
+    def _read_parquet_year(
+        self,
+        url: str,
+        filepath: Optional[str],
+        start_date: datetime,
+        stop_date: datetime,
+        overwrite: bool = False,
+        revalidate: bool = False,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Read the row groups and columns of one Parquet year index that the
+        request needs. When caching, the whole file is cached and read
+        locally, otherwise only the needed parts are downloaded.
+        """
+        if filepath is not None:
+            source = self._fetch_index_file(url, filepath, overwrite, revalidate)
+            if source is None:
+                return None
+        else:
+            # Small blocks, column chunks bigger than that are one request
+            try:
+                source = RangeFile(
+                    url, block_size=16384, **self.client_kwargs, **self.fetch_options
+                )
+            except FileNotFoundError as e:
+                if e.errno == errno.ENOENT:
+                    self._record_missing(url, filepath)
+                return None
+        return read_parquet_index(source, start_date, stop_date, columns)
+
+    def _fetch_index_file(
+        self,
+        url: str,
+        filepath: Optional[str],
+        overwrite: bool = False,
+        revalidate: bool = False,
+    ) -> Union[BytesIO, str, None]:
+        """
+        Get one year index, from the cache folder if possible.
+
+        Returns:
+            The cache file path if the cached copy is used, else the
+            downloaded content, or None if the index does not exist. A
+            stale cached copy is still used if it cannot be revalidated.
+        """
+        current, validators = self._cached_index(filepath, overwrite, revalidate)
+        if current is not None:
+            return current
+        info = {}
+        # If have ListBucket perms, no such key error will be raised
+        # instead of client error
+        fr_bytes_file = fetch_S3orURL(
+            url,
+            rawbytes=True,
+            validators=validators,
+            info=info,
+            **self.client_kwargs,
+            **self.fetch_options,
+        )
+        return self._store_index_file(url, filepath, validators, fr_bytes_file, info)
 
-        # If caching
-        if self.cache_folder is None:
-            path = None
-        else:
-            # Create the path for storing cached files and folder if not exist
-            path = os.path.join(self.cache_folder, catalog_id)
-            if not os.path.exists(path):
-                os.mkdir(path)
+    def _cached_index(
+        self, filepath: Optional[str], overwrite: bool = False, revalidate: bool = False
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Check the cache folder before fetching a year index, the first
+        half of _fetch_index_file.
 
-        # Compute minimum and maximum year from start and end date respectively
-        year_start_date = self.year_range(
-            catalog_start_date, start_date, direction="max"
-        )
-        year_stop_date = self.year_range(catalog_stop_date, stop_date, direction="min")
+        Returns:
+            The cache file path if the cached copy can be used without
+            asking the server (else None), and the validators of the
+            cached copy for a conditional request (None if not cached).
+        """
+        cached = self._has_cached(filepath, overwrite)
+        if cached and not revalidate and self._cache_is_current(filepath):
+            return filepath, None
+        # Ask the server to only send the file if it changed since cached,
+        # also when the catalog entry changed (or the cached copy expired)
+        return None, self._read_cache_meta(filepath) if cached else None
 
-        # Local or different: Could be same bucket or different bucket
-        # not enforcing being same bucket
-        # allowing https addition
-        if not loc.startswith("http"):
-            bucket_name = loc[5:].split("/", 1)[0]
-            loc = loc[len(bucket_name) + 6 :]
+    def _store_index_file(
+        self,
+        url: str,
+        filepath: Optional[str],
+        validators: Optional[Dict],
+        fr_bytes_file: Optional[BytesIO],
+        info: Dict,
+    ) -> Union[BytesIO, str, None]:
+        """
+        Handle the response to a year index fetch, the second half of
+        _fetch_index_file: keep the cached copy if it is unchanged (304)
+        or the server could not be asked, remember missing indices and
+        cache new content.
 
-        # Define empty array for storing data frames
-        frs = []
+        Parameters:
+            validators (dict): As returned by _cached_index, None if the
+                         year was not cached.
+            info (dict): The response headers and "status" of the fetch.
 
-        # Loop through all the years
+        Returns:
+            As _fetch_index_file.
+        """
+        cached = validators is not None
+        if cached and info.get("status") == 304:
+            self._write_cache_meta(filepath, dict(validators, **info))
+            return filepath
+        if cached and info.get("status") not in (200, 206, 404):
+            # The server could not be asked, a stale year beats a lost one
+            logging.warning(f"Could not revalidate {url}, using the cached {filepath}")
+            return filepath
+        if info.get("status") == 404:
+            self._record_missing(url, filepath)
+        elif fr_bytes_file is not None:
+            missing_index_cache.discard(url)
+        if fr_bytes_file is not None and filepath is not None:
+            self._write_cache(filepath, fr_bytes_file, info)
+        return fr_bytes_file
 
-        for year in range(year_start_date, year_stop_date + 1):
-            filename = f"{eid}_{year}.{ndxformat}"
+    @staticmethod
+    def _read_cache_meta(filepath: str) -> Dict:
+        """
+        The metadata saved with a cached year index, e.g. the "etag" and
+        "last-modified" response headers, or {} if there is none.
+        """
+        try:
+            with open(filepath + ".meta") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
 
-            if path is None:
-                filepath = None
-            else:
-                filepath = os.path.join(path, filename)
+    def _write_cache(self, filepath: str, fr_bytes_file: BytesIO, info: Dict) -> None:
+        """
+        Save a downloaded year index to the cache folder, with the
+        response headers needed to revalidate it later.
+        """
+        _atomic_write(filepath, fr_bytes_file.getvalue())
+        self._write_cache_meta(filepath, info)
+        # The index exists after all, e.g. fetched with overwrite
+        if os.path.exists(filepath + ".missing"):
+            os.remove(filepath + ".missing")
 
-            # If file does not exist download it from s3
-            # And save it to the given path
-            if (
-                not self.cache
-                or overwrite
-                or (filepath is not None and not os.path.exists(filepath))
-            ):
-                # If have ListBucket perms, no such key error will be raised
-                # instead of client error
-                # allowing https addition
-                if loc.startswith("http"):
-                    fr_bytes_file = fetch_S3orURL(loc + filename, rawbytes=True)
-                else:
-                    fr_bytes_file = fetch_S3orURL(
-                        self.bucket_name + "/" + loc + filename, rawbytes=True
-                    )
+    def _known_missing(
+        self, url: str, filepath: Optional[str], overwrite: bool = False
+    ) -> bool:
+        """
+        True if the year index was recently found missing, by this process
+        (see missing_index_cache) or one sharing the cache folder (a
+        .missing marker file), and the catalog entry has not changed since.
+        """
+        if overwrite:
+            return False
+        version = self._entry_modification(url)
+        if missing_index_cache.is_missing(url, version):
+            return True
+        if not self.cache or filepath is None:
+            return False
+        try:
+            with open(filepath + ".missing") as file:
+                marker = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if marker.get("modification") != version:
+            return False
+        if time.time() - marker.get("fetched", 0) >= missing_index_cache.ttl:
+            return False
+        missing_index_cache.record(url, version, marker["fetched"])
+        return missing_index_cache.is_missing(url, version)
 
-                if fr_bytes_file == None:
-                    continue
+    def _record_missing(self, url: str, filepath: Optional[str]) -> None:
+        """Remember a year index that does not exist, see _known_missing."""
+        if missing_index_cache.ttl <= 0:
+            return
+        version = self._entry_modification(url)
+        missing_index_cache.record(url, version)
+        if filepath is None:
+            return
+        marker = {"fetched": time.time(), "modification": version}
+        try:
+            _atomic_write(filepath + ".missing", json.dumps(marker))
+        except OSError as e:
+            logging.debug(f"Could not write cache file {filepath}.missing: {e}")
+
+    def _write_cache_meta(self, filepath: str, info: Dict) -> None:
+        """
+        Record, next to a cached year index, the "etag" and
+        "last-modified" from info, when it was fetched and the catalog
+        entry's modification time (plus catalog.json's fetch time) then.
+        """
+        meta = {key: info[key] for key in ("etag", "last-modified") if key in info}
+        meta["fetched"] = time.time()
+        meta["modification"] = self._entry_modification(filepath)
+        meta["catalog_fetched"] = self.catalog_fetched
+        _atomic_write(filepath + ".meta", json.dumps(meta))
+
+    def _parse_index_file(
+        self,
+        fr_bytes_file: Union[BytesIO, str],
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+    ) -> pd.DataFrame:
+        """
+        Parse one year index, given its content or its cache file path.
+        Compressed (csv-zip) indices are decompressed as they are parsed.
+        Only the columns asked for (plus start and stop) are parsed, with
+        the given dtypes, see request_cloud_catalog.
+        """
+        frames = self._iter_index_file(fr_bytes_file, columns, dtypes)
+        with contextlib.closing(frames):
+            return next(frames)
 
-                if filepath is not None:
-                    with open(filepath, "wb") as file:
-                        file.write(fr_bytes_file.read())
-                    fr_bytes_file.seek(0)
-                fr = pd.read_csv(fr_bytes_file)
+    def _iter_index_file(
+        self,
+        fr_bytes_file: Union[BytesIO, str],
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        chunksize: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        _parse_index_file, parsing chunksize rows at a time if given.
 
-            # If file exists, read from given path
+        Yields:
+            The whole index, or pieces of chunksize rows.
+        """
+        with open_index(fr_bytes_file) as csv_file:
+            names = self._index_names(csv_file)
+            if names is not None:
+                frames = self._read_index_csv(
+                    csv_file, names, columns, dtypes, chunksize
+                )
             else:
-                fr = pd.read_csv(filepath)
+                # Old spec versions need the whole file to derive stop times
+                fr = self._normalize_index(pd.read_csv(csv_file))
+                step = chunksize or max(len(fr), 1)
+                frames = (fr.iloc[i : i + step] for i in range(0, len(fr), step))
+            for fr in frames:
+                # Parse the times per year, the concatenation need not be walked again
+                for column in ("start", "stop"):
+                    if column in fr.columns:
+                        fr[column] = parse_iso8601(fr[column])
+                yield fr
 
-            # print("Debug, version is ",self.catalog["Cloudy"])
-            try:
-                version = float(self.catalog["Cloudy"])
-            except:
-                version = float(self.catalog["version"])
-            if version < 0.5:
-                # spec before 0.5 was start/key/filesize
-                # generate a 'maybe' stop using start time of prior entry
-                col0 = fr.columns[0]
-                try:
-                    fr.insert(1, "stop", fr[col0].shift(-1))
-                except:
-                    pass  # usually because 'stop' already exists in metadata
-
-            # Handle # if used for the header
-            if fr.columns.values[0][:2] == "# ":
-                fr.columns.values[0] = fr.columns.values[0][2:]
-
-            # Make column names consistent since not enforcing this spec
-            fr.rename(
-                columns={
-                    "start": "start",
-                    "stop": "stop",
-                    "modification": "modification",
-                },
-                inplace=True,
-            )
+    def _index_names(self, csv_file) -> Optional[List[str]]:
+        """
+        The spec column names of an index file, from its first line, as
+        _normalize_index would name them. The file position is kept.
 
-            """ assume first column is start, second is stop, third is key,
-                and fourth is filesize
-                only assuming if not found in column names
-                no error will be thrown if one of these missing,
-                but per spec they are required """
-            if "start" not in fr.columns.values:
-                fr.columns.values[0] = "start"
-            if "stop" not in fr.columns.values:
-                fr.columns.values[1] = "stop"
-            if "datakey" not in fr.columns.values:
-                fr.columns.values[2] = "datakey"
-            if "filesize" not in fr.columns.values:
-                fr.columns.values[3] = "filesize"
-
-            frs.append(fr)
-
-        frs = pd.concat(frs)
-
-        # Filter catalog dataframe to exact requested dates
-        try:
-            frs["start"] = pd.to_datetime(
-                frs["start"], format="%Y-%m-%dT%H:%M:%S.%fZ", exact=False
-            )
-        except:
+        Returns:
+            The names, or None if the file must go through
+            _normalize_index (old spec versions, odd headers).
+        """
+        if self._spec_version() < 0.5:
+            return None
+        position = csv_file.tell()
+        line = csv_file.readline().decode("utf-8", errors="replace")
+        csv_file.seek(position)
+        names = next(csv.reader([line.rstrip("\r\n")]), [])
+        if not names:
+            return None
+        if names[0][:2] == "# ":
+            names[0] = names[0][2:]
+        for index, name in enumerate(INDEX_COLUMNS[: len(names)]):
+            if name not in names:
+                names[index] = name
+        if len(set(names)) < len(names):
+            return None
+        return names
+
+    def _read_index_csv(
+        self,
+        csv_file,
+        names: List[str],
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict] = None,
+        chunksize: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Parse an index file with named columns, see _iter_index_file.
+
+        Yields:
+            The whole index, or pieces of chunksize rows.
+        """
+        usecols = None
+        if columns is not None:
+            wanted = {"start", "stop"}.union(columns)
+            usecols = [name for name in names if name in wanted]
+        dtypes = dtypes or {}
+        read_dtypes = {**INDEX_DTYPES, **dtypes}
+        read_dtypes = {
+            name: dtype
+            for name, dtype in read_dtypes.items()
+            if name in (usecols or names) and name not in ("start", "stop")
+        }
+        options = {"header": 0, "names": names, "usecols": usecols}
+        position, rows = csv_file.tell(), 0
+        if self.engine == "pyarrow" and chunksize is None:
             try:
-                frs["start"] = pd.to_datetime(
-                    frs["start"], format="%Y-%m-%dT%H:%M:%SZ", exact=False
-                )
-            except:
-                frs["start"] = pd.to_datetime(
-                    frs["start"], format="%Y-%m-%dT%H:%MZ", exact=False
+                yield self._read_index_arrow(
+                    csv_file, names, usecols, read_dtypes, dtypes
                 )
+                return
+            except ValueError as e:
+                # e.g. a column whose type changes part way, pandas copes
+                logging.debug(f"pyarrow cannot parse the index, using pandas: {e}")
+                csv_file.seek(position)
         try:
-            frs["stop"] = pd.to_datetime(
-                frs["stop"], format="%Y-%m-%dT%H:%M:%S.%fZ", exact=False
+            if chunksize is None:
+                yield pd.read_csv(csv_file, dtype=read_dtypes, **options)
+                return
+            with pd.read_csv(
+                csv_file, dtype=read_dtypes, chunksize=chunksize, **options
+            ) as reader:
+                for fr in reader:
+                    rows += len(fr)
+                    yield fr
+            return
+        except ValueError:
+            if read_dtypes.keys() <= dtypes.keys():
+                raise
+
+        # e.g. a filesize is missing, so the default int64 does not fit.
+        # Parse again, without the default dtypes, from the first row not
+        # yet yielded
+        csv_file.seek(position)
+        options["dtype"] = {
+            name: dtype for name, dtype in read_dtypes.items() if name in dtypes
+        }
+        options["skiprows"] = range(1, rows + 1)
+        if chunksize is None:
+            yield pd.read_csv(csv_file, **options)
+            return
+        with pd.read_csv(csv_file, chunksize=chunksize, **options) as reader:
+            yield from reader
+
+    @staticmethod
+    def _read_index_arrow(
+        csv_file,
+        names: List[str],
+        usecols: Optional[List[str]],
+        read_dtypes: Dict,
+        dtypes: Dict,
+    ) -> pd.DataFrame:
+        """
+        _read_index_csv with the multithreaded pyarrow CSV reader. Column
+        types are inferred by pyarrow (timestamps included) and the
+        dtypes applied afterwards, with the same fallback as pandas.
+
+        Raises:
+            ValueError (pyarrow.ArrowInvalid) if pyarrow cannot parse it.
+        """
+        pa = _import_pyarrow("pyarrow", "The pyarrow engine")
+        pacsv = _import_pyarrow("pyarrow.csv", "The pyarrow engine")
+        # Text and categorical columns keep the text as is, like pandas
+        text = {
+            name: pa.string()
+            for name, dtype in read_dtypes.items()
+            if pd.api.types.is_string_dtype(dtype)
+            or (
+                isinstance(pd.api.types.pandas_dtype(dtype), pd.CategoricalDtype)
+                and pd.api.types.pandas_dtype(dtype).categories is None
             )
-        except:
-            try:
-                frs["stop"] = pd.to_datetime(
-                    frs["stop"], format="%Y-%m-%dT%H:%M:%SZ", exact=False
-                )
-            except:
-                frs["stop"] = pd.to_datetime(
-                    frs["stop"], format="%Y-%m-%dT%H:%MZ", exact=False
-                )
-        # frs["start"] = pd.to_datetime(frs["start"], format='ISO8601',exact=False)
-        # frs["stop"] = pd.to_datetime(frs["stop"], format='ISO8601',exact=False)
-        frs = frs[(frs["stop"] >= start_date) & (frs["start"] < stop_date)]
+        }
+        table = pacsv.read_csv(
+            csv_file,
+            read_options=pacsv.ReadOptions(column_names=names, skip_rows=1),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=usecols, column_types=text
+            ),
+        )
+        fr = table.to_pandas(split_blocks=True)
+        try:
+            return fr.astype(read_dtypes)
+        except ValueError:
+            if read_dtypes.keys() <= dtypes.keys():
+                raise
+        # e.g. a filesize is missing, as pandas, keep only the asked dtypes
+        return fr.astype({k: v for k, v in read_dtypes.items() if k in dtypes})
+
+    @staticmethod
+    def _filter_dates(
+        fr: pd.DataFrame,
+        start_date: datetime,
+        stop_date: datetime,
+        columns: Optional[List[str]] = None,
+        lookback: timedelta = timedelta(days=1),
+    ) -> pd.DataFrame:
+        """
+        Keep the rows of an index that overlap the requested dates, and
+        the requested columns.
+        """
+        return CloudCatalog._filter_windows(
+            fr, [(start_date, stop_date)], columns, lookback
+        )
+
+    @staticmethod
+    def _filter_windows(
+        fr: pd.DataFrame,
+        windows: List[Tuple[datetime, datetime]],
+        columns: Optional[List[str]] = None,
+        lookback: timedelta = timedelta(days=1),
+    ) -> pd.DataFrame:
+        """
+        Keep the rows of an index that overlap any of the (start, stop)
+        windows, once each, and the requested columns. Time-ordered
+        indices are sliced by binary search, see _window_rows.
+        """
+        # Year indices are parsed as they are read, this catches the rest
+        for column in ("start", "stop"):
+            if not pd.api.types.is_datetime64_any_dtype(fr[column].dtype):
+                fr[column] = parse_iso8601(fr[column])
+
+        start, stop = fr["start"].to_numpy(), fr["stop"].to_numpy()
+        if start.dtype.kind == "M" and fr["start"].is_monotonic_increasing:
+            rows = [
+                CloudCatalog._window_rows(start, stop, start_date, stop_date, lookback)
+                for start_date, stop_date in windows
+            ]
+            if len(rows) == 1 and isinstance(rows[0], slice):
+                fr = fr.iloc[rows[0]]
+            else:
+                rows = [
+                    np.arange(len(fr))[row] if isinstance(row, slice) else row
+                    for row in rows
+                ]
+                fr = fr.iloc[np.unique(np.concatenate(rows))]
+        else:
+            # Not time-ordered (or timezone-aware), mask every row
+            keep = np.zeros(len(fr), dtype=bool)
+            for start_date, stop_date in windows:
+                keep |= (
+                    (fr["stop"] >= start_date) & (fr["start"] < stop_date)
+                ).to_numpy()
+            fr = fr[keep]
+
+        if columns is not None:
+            fr = fr[list(columns)]
+        return fr
+
+    @staticmethod
+    def _window_rows(
+        start: np.ndarray,
+        stop: np.ndarray,
+        start_date: datetime,
+        stop_date: datetime,
+        lookback: timedelta = timedelta(days=1),
+    ) -> Union[slice, np.ndarray]:
+        """
+        The rows of a time-ordered index that overlap [start_date,
+        stop_date). Rows starting at or after stop_date, or more than
+        lookback (the longest file duration) before start_date, are cut
+        off by binary search, only the rows in between are compared. If a
+        row before the look-back does reach start_date, all rows before
+        stop_date are compared instead, so the result is always exact.
+
+        Returns:
+            A slice if the rows are contiguous, else an array of positions.
+        """
+        start_date, stop_date = np.datetime64(start_date), np.datetime64(stop_date)
+        high = start.searchsorted(stop_date)
+        low = min(start.searchsorted(start_date - np.timedelta64(lookback)), high)
+        if low and np.nanmax(stop[:low]) >= start_date:
+            low = 0
+        overlaps = stop[low:high] >= start_date
+        if overlaps.all():
+            return slice(low, high)
+        # Rows only stop before start_date at the start of the range
+        first = int(overlaps.argmax()) if overlaps.any() else high - low
+        if overlaps[first:].all():
+            return slice(low + first, high)
+        return np.flatnonzero(overlaps) + low
 
-        return frs
+    @staticmethod
+    def _finish_request(
+        frs: List[pd.DataFrame], columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Combine the filtered year indices. With no matches, an empty
+        DataFrame with the usual (or requested) columns is returned.
+        """
+        if frs:
+            return pd.concat(frs)
+        empty = pd.DataFrame(
+            {
+                "start": pd.Series(dtype="datetime64[ns]"),
+                "stop": pd.Series(dtype="datetime64[ns]"),
+                "datakey": pd.Series(dtype=str),
+                "filesize": pd.Series(dtype="int64"),
+            }
+        )
+        if columns is not None:
+            empty = empty.reindex(columns=list(columns))
+        return empty
 
     @staticmethod
     def stream(
         cloud_catalog: pd.DataFrame,
         process_func: Callable[[BytesIO, str, str, int], None],
         ignore_faileds3get: bool = False,
+        streaming: bool = False,
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+        read_ahead: Optional[int] = None,
+        **client_kwargs,
     ) -> None:
         """
         Downloads files from S3 and passes them to a processing function.
+        process_func is always called from the calling thread, one file at
+        a time, also when files are downloaded concurrently.
 
         Parameters:
             cloud_catalog (pd.DataFrame): A pandas DataFrame containing
-                                          the dataset catalog information.
+                                          the dataset catalog information,
+                                          with plain or compact datakeys.
             process_func (Callable): A function that takes a BytesIO object,
                          a string representing the start date of the file,
                          a string representing the stop date of the file, and
                          an integer representing the file size as arguments.
-            ignore_faileds3get (bool): A boolean that determines if
-                         the FailedS3Get is not thrown.
-        """
-
-        # original version, added https mod
-        # s3_client = boto3.client("s3")
-
-        fr_bytes_file = None
-        for _, row in cloud_catalog.iterrows():
-            # Get the S3 URL from the key in the dataframe
-            s3_url = row["datakey"]
-            fr_bytes_file = fetch_S3orURL(s3_url, rawbytes=True)
-            """ Pass the BytesIO object, start date, and file size to
-                the processing function
-                start may be a date object so making a string just in case
-                for consistency"""
-            process_func(
-                fr_bytes_file, str(row["start"]), str(row["stop"]), row["filesize"]
-            )
+            ignore_faileds3get (bool): If True, files that cannot be
+                         fetched are skipped (with a warning) instead of
+                         raising FailedS3Get.
+            streaming (bool): If True, process_func gets a forward-only
+                         file-like object over the response body instead of
+                         a BytesIO, so it can parse while the file downloads
+                         and large files are never held in memory.
+            max_workers (int, optional): Download up to this many files
+                         at once in a thread pool. By default they are
+                         downloaded one at a time. Raise
+                         max_pool_connections to match for S3 access.
+            ordered (bool): With max_workers, pass the files to
+                         process_func in catalog order (True), or as soon
+                         as each download completes (False).
+            read_ahead (int, optional): Keep this many files downloading
+                         (or downloaded) ahead of the one process_func is
+                         working on, so downloads and processing overlap.
+                         They are fetched one at a time unless max_workers
+                         is given, which otherwise reads that many ahead.
+                         Up to read_ahead files are held in memory, with
+                         streaming only their responses are opened ahead.
+            client_kwargs: parameters for boto3.client, the matching
+                         shared client is reused for every file. Its
+                         max_pool_connections can be given here too,
+                         raise it with max_workers.
+
+        Raises:
+            FailedS3Get if a file cannot be fetched, unless
+            ignore_faileds3get. Downloads not yet handed over are then
+            cancelled, as they are if process_func raises.
+        """
+
+        rows = zip(
+            _iter_datakeys(cloud_catalog),
+            cloud_catalog["start"],
+            cloud_catalog["stop"],
+            cloud_catalog["filesize"],
+        )
+
+        def fetch(row):
+            try:
+                fr_bytes_file = fetch_S3orURL(
+                    row[0], rawbytes=True, streaming=streaming, **client_kwargs
+                )
+            except Exception as e:
+                return row, None, e
+            return row, fr_bytes_file, None
+
+        def close(fr_bytes_file):
+            # Hand the connection back to the pool even if not fully read
+            if streaming and fr_bytes_file is not None:
+                fr_bytes_file.close()
+
+        fetched = CloudCatalog._prefetch(
+            fetch,
+            rows,
+            max_workers,
+            ordered,
+            lambda result: close(result[1]),
+            ahead=read_ahead,
+        )
+        # Closing the generator cancels the downloads left if this stops
+        with contextlib.closing(fetched):
+            for (s3_url, start, stop, filesize), fr_bytes_file, error in fetched:
+                if fr_bytes_file is None:
+                    if not ignore_faileds3get:
+                        raise FailedS3Get(f"Failed to fetch {s3_url}") from error
+                    logging.warning(f"Skipping {s3_url}, it could not be fetched")
+                    continue
+                """ Pass the BytesIO object, start date, and file size to
+                    the processing function
+                    start may be a date object so making a string just in case
+                    for consistency"""
+                try:
+                    process_func(fr_bytes_file, str(start), str(stop), filesize)
+                finally:
+                    close(fr_bytes_file)
 
     @staticmethod
     def stream_uri(
@@ -717,38 +3590,56 @@ class CloudCatalog:
 
         Parameters:
             cloud_catalog (pd.DataFrame): A pandas DataFrame containing
-                         the dataset catalog information.
+                         the dataset catalog information, with plain or
+                         compact datakeys.
             process_func (Callable): A function that takes
                          a string representing the S3 URL,
                          a string representing the start date of the file,
                          a string representing the stop date of the file, and
                          an integer representing the file size as arguments.
         """
-        for _, row in cloud_catalog.iterrows():
-            # Get the S3 URL from the key in the dataframe
-            s3_url = row["datakey"]
-
-            """ Pass the S3 URL, start date, and file size to
-                the processing function
-                start may be a date object so making a string
-                just in case for consistency"""
-            process_func(s3_url, str(row["start"]), str(row["stop"]), row["filesize"])
+        rows = zip(
+            _iter_datakeys(cloud_catalog),
+            cloud_catalog["start"],
+            cloud_catalog["stop"],
+            cloud_catalog["filesize"],
+        )
+        for s3_url, start, stop, filesize in rows:
+            """Pass the S3 URL, start date, and file size to
+            the processing function
+            start may be a date object so making a string
+            just in case for consistency"""
+            process_func(s3_url, str(start), str(stop), filesize)
 
 
 class EntireCatalogSearch:
     """Use to search through all the catalogs by using the global catalog
     to get all the local catalogs."""
 
-    def __init__(self, catalog_url: Optional[str] = None, **client_kwargs):
+    def __init__(
+        self,
+        catalog_url: Optional[str] = None,
+        http_options: Optional[Dict] = None,
+        retry_options: Optional[Dict] = None,
+        **client_kwargs,
+    ):
         """
         Parameters:
             catalog_url (str, optional): URL of the global catalog,
                         default is None.
+            http_options (dict, optional): HTTP session settings for this
+                        search, see CloudCatalog.
+            retry_options (dict, optional): Retry settings for this
+                        search, see CloudCatalog.
             client_kwargs: Keyword arguments passed to the CloudCatalog object.
         """
-
+        session_pool = None
+        if http_options is not None:
+            session_pool = http_session_pool.variant(**http_options)
         # Get the global catalog
-        self.global_catalog = CatalogRegistry(catalog_url=catalog_url)
+        self.global_catalog = CatalogRegistry(
+            catalog_url=catalog_url, session_pool=session_pool
+        )
 
         # Combine the global catalog with local catalogs from each entry
         self.combined_catalog = []
@@ -757,7 +3648,13 @@ class EntireCatalogSearch:
         for entry in entries:
             endpoint = self.global_catalog.get_endpoint(entry["name"], entry["region"])
             try:
-                cloud_catalog = CloudCatalog(endpoint, cache=False, **client_kwargs)
+                cloud_catalog = CloudCatalog(
+                    endpoint,
+                    cache=False,
+                    http_options=http_options,
+                    retry_options=retry_options,
+                    **client_kwargs,
+                )
                 local_catalog = cloud_catalog.get_catalog()
                 self.combined_catalog.append(local_catalog)
             except Exception as e:
@@ -765,6 +3662,10 @@ class EntireCatalogSearch:
                     f"Failed to fetch local catalog for entry {entry['name']} (Region: {entry['region']}; Endpoint: {entry['endpoint']}): {e}\n"
                 )
                 failed_entries.append((entry["name"], entry["region"]))
+        self._log_failures(failed_entries, entries)
+
+    @staticmethod
+    def _log_failures(failed_entries: List[Tuple[str, str]], entries: List[Dict]):
         if len(failed_entries) > 0:
             msg = f"Failed Local Catalog Fetches ({len(failed_entries)}/{len(entries)}): \n[\n"
             for entry in failed_entries:
@@ -837,3 +3738,390 @@ class EntireCatalogSearch:
         # Sort results by the most matching keywords
         sorted_results = sorted(entry_counts, key=lambda x: x[1], reverse=True)
         return [entry for entry, count in sorted_results if count > 0]
+
+
+"""
+Asyncio API. Needs the optional aiohttp package, imported on first use.
+"""
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError(
+            "The asyncio API needs aiohttp, install it with 'pip install aiohttp'."
+        ) from e
+    return aiohttp
+
+
+async def fetch_S3orURL_async(
+    session,
+    s3url,
+    region="us-east-1",
+    rawbytes=False,
+    info=None,
+    validators=None,
+    **client_kwargs,
+):
+    """
+    Asyncio version of fetch_S3orURL. The object is fetched over https
+    with the given aiohttp session, which is enough for public buckets
+    and needs no threads. If https fails, or is known not to work for
+    this endpoint, the blocking fetch_S3orURL cascade (including signed
+    S3 access) runs in the default executor instead.
+
+    info, if given, is filled with the lowercased response headers of the
+    final attempt and its HTTP status under "status", so a missing object
+    (404) can be told apart.
+
+    validators makes the request conditional, as for fetch_S3orURL: if
+    the cached copy is current, None is returned and info["status"] is 304.
+
+    Returns None if the object is missing or cannot be fetched.
+    """
+    headers = {}
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last-modified"):
+        headers["If-Modified-Since"] = validators["last-modified"]
+    endpoint = s3url_to_endpoint(s3url)
+    if s3url.startswith("http"):
+        methods = ("https",)
+    else:
+        methods = AccessStrategyCache.METHODS
+    if "https" in access_strategy_cache.order(endpoint, methods):
+        try:
+            async with session.get(s3url_to_https(s3url), headers=headers) as response:
+                if response.status in (200, 304, 404):
+                    access_strategy_cache.record(endpoint, "https", True)
+                    access_strategy_cache.count(methods, "https", 1)
+                    if info is not None:
+                        info.update(
+                            (key.lower(), val) for key, val in response.headers.items()
+                        )
+                        info["status"] = response.status
+                    if response.status != 200:
+                        return None
+                    content = await response.read()
+                    return BytesIO(content) if rawbytes else json.loads(content)
+                logging.debug(f"Fetch of {s3url} via https: {response.status}")
+        except Exception as e:
+            logging.debug(f"Fetch of {s3url} via https failed: {e}")
+        access_strategy_cache.record(endpoint, "https", False)
+        if s3url.startswith("http"):
+            return None
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        functools.partial(
+            fetch_S3orURL,
+            s3url,
+            region=region,
+            rawbytes=rawbytes,
+            info=info,
+            validators=validators,
+            **client_kwargs,
+        ),
+    )
+
+
+class AsyncCloudCatalog(CloudCatalog):
+    """
+    Asyncio version of CloudCatalog, with at most max_concurrency
+    downloads in flight. Nothing is fetched on creation, use it as an
+    async context manager or call open():
+
+        async with AsyncCloudCatalog("s3://gov-nasa-hdrl-data1/") as fr:
+            myfiles = await fr.request_cloud_catalog(fr_id, start_date, stop_date)
+            async for fr_bytes_file, start, stop, filesize in fr.stream(myfiles):
+                ...
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        cache_folder: Optional[str] = None,
+        cache: bool = False,
+        max_concurrency: int = 16,
+        session=None,
+        **client_kwargs,
+    ) -> None:
+        """
+        Parameters:
+            bucket_name (str): The name of the s3 bucket.
+            cache_folder (str): Folder to store the file catalog cache,
+                                defaults to bucket_name + '_cache'.
+            cache (optional, defaults to False, bool): See CloudCatalog.
+            max_concurrency (int): Most downloads in flight at once.
+            session (optional, aiohttp.ClientSession): Session to fetch
+                  with. By default one is created, and closed by close().
+            client_kwargs: parameters for boto3.client, used when falling
+                  back to signed S3 access.
+        """
+        self._configure(bucket_name, cache, None, None, client_kwargs)
+        self.max_concurrency = max_concurrency
+        self.session = session
+        self._own_session = session is None
+        self._cache_folder = cache_folder
+        self._semaphore = None
+        self.catalog = None
+        self.cache_folder = None
+
+    @classmethod
+    async def open(cls, bucket_name: str, **kwargs) -> "AsyncCloudCatalog":
+        """
+        Create an AsyncCloudCatalog and fetch its catalog, see __init__
+        for the parameters.
+        """
+        cloud_catalog = cls(bucket_name, **kwargs)
+        await cloud_catalog.load()
+        return cloud_catalog
+
+    async def load(self) -> None:
+        """Fetch and check the bucket's catalog.json."""
+        aiohttp = _import_aiohttp()
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        catalog = await self._fetch(self.bucket_name + "/catalog.json", rawbytes=False)
+        self._load_catalog(catalog, self._cache_folder)
+
+    async def close(self) -> None:
+        """Close the aiohttp session, if this object created it."""
+        if self._own_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> "AsyncCloudCatalog":
+        try:
+            await self.load()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _fetch(
+        self, s3url: str, rawbytes: bool = True, info=None, validators=None
+    ):
+        async with self._semaphore:
+            return await fetch_S3orURL_async(
+                self.session,
+                s3url,
+                rawbytes=rawbytes,
+                info=info,
+                validators=validators,
+                **self.client_kwargs,
+                **self.fetch_options,
+            )
+
+    async def request_cloud_catalog(
+        self,
+        catalog_id: str,
+        start_date: Optional[str] = None,
+        stop_date: Optional[str] = None,
+        overwrite: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Asyncio version of CloudCatalog.request_cloud_catalog, fetching
+        all the year indices concurrently.
+
+        Parameters:
+            catalog_id (str): The id of the catalog entry in the s3 bucket.
+            start_date (str): Start date for which files are needed
+                              (default None). ISO 8601 standard.
+            stop_date (str): End date for which files are needed
+                              (default None). ISO 8601 standard.
+            overwrite (bool): Overwrite files already cached if within request
+                              cache in initilization must have been true.
+
+        Returns:
+            A pandas Dataframe containing the requested dataset catalog.
+        """
+        start_date, stop_date, files = self._plan_request(
+            catalog_id, start_date, stop_date
+        )
+
+        def lookup_year(url, filepath):
+            if self._known_missing(url, filepath, overwrite):
+                return None
+            return self._cached_index(filepath, overwrite)
+
+        def finish_year(url, fr_bytes_file):
+            if fr_bytes_file is None:
+                return None
+            if url.endswith(".parquet"):
+                fr = read_parquet_index(fr_bytes_file, start_date, stop_date)
+            else:
+                fr = self._parse_index_file(fr_bytes_file)
+            return self._filter_dates(fr, start_date, stop_date)
+
+        def read_parquet_year(url):
+            fr = self._read_parquet_year(url, None, start_date, stop_date)
+            return None if fr is None else self._filter_dates(fr, start_date, stop_date)
+
+        async def read_year(url, filepath):
+            # Cache I/O and parsing block, so they run in the default
+            # executor and leave the event loop to the downloads
+            loop = asyncio.get_running_loop()
+            lookup = await loop.run_in_executor(None, lookup_year, url, filepath)
+            if lookup is None:
+                return None
+            if url.endswith(".parquet") and filepath is None:
+                # Ranged reads of the footer and overlapping row groups only
+                async with self._semaphore:
+                    return await loop.run_in_executor(None, read_parquet_year, url)
+            fr_bytes_file, validators = lookup
+            if fr_bytes_file is None:
+                # Conditional if cached, like the blocking _fetch_index_file
+                info = {}
+                fetched = await self._fetch(url, info=info, validators=validators)
+                fr_bytes_file = await loop.run_in_executor(
+                    None,
+                    self._store_index_file,
+                    url,
+                    filepath,
+                    validators,
+                    fetched,
+                    info,
+                )
+            return await loop.run_in_executor(None, finish_year, url, fr_bytes_file)
+
+        # gather keeps the year order
+        frs = await asyncio.gather(*(read_year(*file) for file in files))
+        frs = [fr for fr in frs if fr is not None]
+        return self._finish_request(frs)
+
+    async def stream(
+        self, cloud_catalog: pd.DataFrame, ignore_faileds3get: bool = False
+    ):
+        """
+        Asyncio version of CloudCatalog.stream: an async generator that
+        downloads up to max_concurrency files ahead and yields them in
+        catalog order.
+
+        Parameters:
+            cloud_catalog (pd.DataFrame): A pandas DataFrame containing
+                                          the dataset catalog information.
+            ignore_faileds3get (bool): If True, files that cannot be
+                         fetched are skipped instead of raising FailedS3Get.
+
+        Yields:
+            A tuple of a BytesIO object, a string representing the start
+            date of the file, a string representing the stop date of the
+            file, and an integer representing the file size.
+        """
+        rows = zip(
+            _iter_datakeys(cloud_catalog),
+            cloud_catalog["start"],
+            cloud_catalog["stop"],
+            cloud_catalog["filesize"],
+        )
+        pending = deque()
+        try:
+            for s3_url, start, stop, filesize in rows:
+                task = asyncio.ensure_future(self._fetch(s3_url))
+                pending.append((task, s3_url, str(start), str(stop), filesize))
+                if len(pending) < self.max_concurrency:
+                    continue
+                result = await self._next_streamed(pending, ignore_faileds3get)
+                if result is not None:
+                    yield result
+            while pending:
+                result = await self._next_streamed(pending, ignore_faileds3get)
+                if result is not None:
+                    yield result
+        finally:
+            for task, *_ in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _next_streamed(pending: deque, ignore_faileds3get: bool):
+        task, s3_url, start, stop, filesize = pending.popleft()
+        fr_bytes_file = await task
+        if fr_bytes_file is None:
+            if not ignore_faileds3get:
+                raise FailedS3Get(f"Failed to fetch {s3_url}")
+            logging.warning(f"Skipping {s3_url}, it could not be fetched")
+            return None
+        return fr_bytes_file, start, stop, filesize
+
+
+class AsyncEntireCatalogSearch(EntireCatalogSearch):
+    """
+    EntireCatalogSearch with the bucket catalogs fetched concurrently
+    using asyncio. Create it with
+
+        search = await AsyncEntireCatalogSearch.open()
+    """
+
+    def __init__(self) -> None:
+        # Nothing is fetched here, see open()
+        self.global_catalog = None
+        self.combined_catalog = []
+
+    @classmethod
+    async def open(
+        cls,
+        catalog_url: Optional[str] = None,
+        max_concurrency: int = 16,
+        **client_kwargs,
+    ) -> "AsyncEntireCatalogSearch":
+        """
+        Fetch the global catalog and every bucket catalog it lists.
+
+        Parameters:
+            catalog_url (str, optional): URL of the global catalog,
+                        see CatalogRegistry.
+            max_concurrency (int): Most catalog fetches in flight at once.
+            client_kwargs: Keyword arguments passed to AsyncCloudCatalog.
+        """
+        aiohttp = _import_aiohttp()
+        search = cls()
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max_concurrency)
+        ) as session:
+            catalog_url = CatalogRegistry.resolve_url(catalog_url)
+            async with session.get(catalog_url) as response:
+                if response.status != 200:
+                    raise requests.ConnectionError(
+                        f"Get Request for Global Catalog Failed. Catalog url: {catalog_url}"
+                    )
+                catalog = json.loads(await response.read())
+            search.global_catalog = CatalogRegistry(catalog_url, catalog=catalog)
+
+            async def load(entry):
+                endpoint = search.global_catalog.get_endpoint(
+                    entry["name"], entry["region"]
+                )
+                cloud_catalog = AsyncCloudCatalog(
+                    endpoint,
+                    max_concurrency=max_concurrency,
+                    session=session,
+                    **client_kwargs,
+                )
+                await cloud_catalog.load()
+                return cloud_catalog.get_catalog()
+
+            entries = search.global_catalog.get_registry()
+            results = await asyncio.gather(
+                *(load(entry) for entry in entries), return_exceptions=True
+            )
+
+        failed_entries = []
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                logging.debug(
+                    f"Failed to fetch local catalog for entry {entry['name']} (Region: {entry['region']}; Endpoint: {entry['endpoint']}): {result}\n"
+                )
+                failed_entries.append((entry["name"], entry["region"]))
+            else:
+                search.combined_catalog.append(result)
+        search._log_failures(failed_entries, entries)
+        return search
@@ -0,0 +1,240 @@
+"""
+A local HTTP stand-in for a CloudCatalog bucket, so fetch paths can be
+tested without network access.
+"""
+
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import cloudcatalog
+
+
+@pytest.fixture(autouse=True)
+def no_frame_cache(monkeypatch):
+    """
+    Tests count downloads, so the process-wide cache of parsed years is
+    off unless a test turns it on.
+    """
+    monkeypatch.setattr(cloudcatalog, "frame_cache", cloudcatalog.FrameCache(0))
+
+
+@pytest.fixture(autouse=True)
+def fresh_missing_index_cache(monkeypatch):
+    """Missing indices recorded by one test are not known to the next."""
+    monkeypatch.setattr(
+        cloudcatalog, "missing_index_cache", cloudcatalog.MissingIndexCache()
+    )
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers), self.client_address))
+        with server.lock:
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            self.respond(server)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def respond(self, server):
+        time.sleep(server.delays.get(self.path.split("?")[0], 0))
+        body = server.files.get(self.path.split("?")[0])
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if server.ranges and match:
+            first, last = int(match.group(1)), int(match.group(2))
+            if first >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            last = min(last, len(body) - 1)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{len(body)}")
+            body = body[first : last + 1]
+        else:
+            self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        server.bytes_sent += len(body)
+
+
+@pytest.fixture
+def standin():
+    """
+    Serves `standin.files` ({path: bytes}) at `standin.url`, recording
+    each request as (path, headers, client_address) in `standin.requests`
+    and the body bytes sent in `standin.bytes_sent`. Range requests are
+    honored unless `standin.ranges` is set to False, and If-None-Match
+    against the ETag (an MD5 of the content) gives 304. Paths in
+    `standin.delays` ({path: seconds}) are answered that much later.
+    The most requests ever served at once is kept in
+    `standin.peak_in_flight`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.files = {}
+    server.requests = []
+    server.bytes_sent = 0
+    server.ranges = True
+    server.delays = {}
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.peak_in_flight = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_index(year, rows, cadence=timedelta(minutes=10), header=True):
+    """A synthetic, time-ordered <id>_YYYY.csv index as bytes."""
+    lines = ["# start,stop,datakey,filesize"] if header else []
+    start = datetime(year, 1, 1)
+    for row in range(rows):
+        stop = start + cadence - timedelta(seconds=1)
+        lines.append(
+            f"{start:%Y-%m-%dT%H:%M:%SZ},{stop:%Y-%m-%dT%H:%M:%SZ},"
+            f"s3://gov-nasa-hdrl-data1/mission/{year}/file_{row:07d}.cdf,{1000 + row}"
+        )
+        start += cadence
+    return ("\n".join(lines) + "\n").encode()
+
+
+@pytest.fixture
+def bucket(standin):
+    """
+    The stand-in set up as a bucket with a catalog.json holding one
+    dataset, "synthetic", with 2019 and 2020 year indices of
+    `bucket.rows` rows each and no 2021 index.
+    """
+    standin.rows = 20000
+    standin.files["/catalog.json"] = json.dumps(
+        {
+            "Cloudy": "1.0",
+            "endpoint": standin.url + "/",
+            "name": "Stand-in bucket",
+            "region": "us-east-1",
+            "egressPolicy": "none",
+            "status": {"code": 1200, "message": "OK"},
+            "catalog": [
+                {
+                    "id": "synthetic",
+                    "index": standin.url + "/synthetic/",
+                    "title": "Synthetic 10 minute cadence dataset",
+                    "start": "2019-01-01T00:00Z",
+                    "stop": "2021-12-31T23:59Z",
+                    "modification": "2022-01-01T00:00Z",
+                    "indextype": "csv",
+                    "filetype": "cdf",
+                }
+            ],
+        }
+    ).encode()
+    for year in (2019, 2020):
+        standin.files[f"/synthetic/synthetic_{year}.csv"] = make_index(
+            year, standin.rows
+        )
+    return standin
+
+
+def add_entry(bucket, dataset_id, indextype):
+    """Add a copy of the "synthetic" entry to the bucket's catalog.json."""
+    catalog = json.loads(bucket.files["/catalog.json"])
+    entry = dict(catalog["catalog"][0])
+    entry.update(
+        id=dataset_id, index=f"{bucket.url}/{dataset_id}/", indextype=indextype
+    )
+    catalog["catalog"].append(entry)
+    bucket.files["/catalog.json"] = json.dumps(catalog).encode()
+
+
+@pytest.fixture
+def wide_bucket(bucket):
+    """
+    The bucket with a second dataset, "synthetic_wide", whose 2019 index
+    has two optional columns, quality and rsun, after the spec ones.
+    """
+    add_entry(bucket, "synthetic_wide", "csv")
+    lines = bucket.files["/synthetic/synthetic_2019.csv"].decode().splitlines()
+    lines[0] += ",quality,rsun"
+    for row in range(1, len(lines)):
+        lines[row] += f",{row % 3},{960.5 + row % 7}"
+    bucket.files["/synthetic_wide/synthetic_wide_2019.csv"] = (
+        "\n".join(lines) + "\n"
+    ).encode()
+    return bucket
+
+
+@pytest.fixture
+def zip_bucket(bucket):
+    """
+    The bucket with a second dataset, "synthetic_zip", holding the same
+    2019 and 2020 indices as csv-zip.
+    """
+    add_entry(bucket, "synthetic_zip", "csv-zip")
+    for year in (2019, 2020):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(
+                f"synthetic_zip_{year}.csv",
+                bucket.files[f"/synthetic/synthetic_{year}.csv"],
+            )
+        bucket.files[f"/synthetic_zip/synthetic_zip_{year}.csv.zip"] = buffer.getvalue()
+    return bucket
+
+
+@pytest.fixture
+def parquet_bucket(bucket):
+    """
+    The bucket with a second dataset, "synthetic_parquet", holding the
+    same 2019 and 2020 indices as Parquet with row groups of 1000 rows.
+    """
+    pa = pytest.importorskip("pyarrow")
+    parquet = pytest.importorskip("pyarrow.parquet")
+    import pandas as pd
+
+    add_entry(bucket, "synthetic_parquet", "parquet")
+    for year in (2019, 2020):
+        fr = pd.read_csv(io.BytesIO(bucket.files[f"/synthetic/synthetic_{year}.csv"]))
+        fr.columns = ["start", "stop", "datakey", "filesize"]
+        for column in ("start", "stop"):
+            fr[column] = pd.to_datetime(fr[column], utc=True)
+        buffer = io.BytesIO()
+        parquet.write_table(
+            pa.Table.from_pandas(fr, preserve_index=False), buffer, row_group_size=1000
+        )
+        bucket.files[
+            f"/synthetic_parquet/synthetic_parquet_{year}.parquet"
+        ] = buffer.getvalue()
+    return bucket
@@ -0,0 +1,142 @@
+import asyncio
+import json
+
+import pytest
+import cloudcatalog
+
+aiohttp = pytest.importorskip("aiohttp")
+
+
+def test_async_request_cloud_catalog(bucket):
+    start, stop = "2019-05-19T00:00:00Z", "2020-01-02T00:00:00Z"
+    expected = cloudcatalog.CloudCatalog(bucket.url).request_cloud_catalog(
+        "synthetic", start, stop
+    )
+
+    async def request():
+        async with cloudcatalog.AsyncCloudCatalog(bucket.url) as fr:
+            return await fr.request_cloud_catalog("synthetic", start, stop)
+
+    files = asyncio.run(request())
+    assert files.reset_index(drop=True).equals(expected.reset_index(drop=True))
+
+
+def test_async_cache_keeps_validators(bucket, tmp_path):
+    start, stop = "2019-12-31T00:00:00Z", "2020-01-02T00:00:00Z"
+
+    async def request():
+        async with cloudcatalog.AsyncCloudCatalog(
+            bucket.url, cache_folder=str(tmp_path), cache=True
+        ) as fr:
+            return await fr.request_cloud_catalog("synthetic", start, stop)
+
+    files = asyncio.run(request())
+    assert len(files) == 144
+    # Cached years can be revalidated later, like the blocking API's
+    for year in (2019, 2020):
+        with open(tmp_path / "synthetic" / f"synthetic_{year}.csv.meta") as file:
+            assert json.load(file)["etag"]
+
+
+def test_async_cache_revalidation(bucket, tmp_path):
+    start, stop = "2019-12-31T00:00:00Z", "2020-01-02T00:00:00Z"
+
+    def request():
+        async def run():
+            async with cloudcatalog.AsyncCloudCatalog(
+                bucket.url, cache_folder=str(tmp_path), cache=True
+            ) as fr:
+                return await fr.request_cloud_catalog("synthetic", start, stop)
+
+        return asyncio.run(run())
+
+    first = request()
+    # A new modification time revalidates the cached years, none changed
+    bucket.files["/catalog.json"] = bucket.files["/catalog.json"].replace(
+        b"2022-01-01T00:00Z", b"2022-06-01T00:00Z"
+    )
+    sent = bucket.bytes_sent
+    assert request().equals(first)
+    checks = [
+        headers for _, headers, _ in bucket.requests if "If-None-Match" in headers
+    ]
+    assert len(checks) == 2
+    assert bucket.bytes_sent - sent < 10000
+
+    # Years that cannot be revalidated are served stale, not dropped
+    bucket.files["/catalog.json"] = (
+        bucket.files["/catalog.json"]
+        .replace(b"2022-06-01T00:00Z", b"2022-09-01T00:00Z")
+        .replace(bucket.url.encode() + b"/synthetic/", b"http://127.0.0.1:1/synthetic/")
+    )
+    stale = request()
+    assert len(stale) == 144
+    assert stale.equals(first)
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_async_parquet_index(parquet_bucket, tmp_path, cache):
+    start, stop = "2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"
+    expected = cloudcatalog.CloudCatalog(parquet_bucket.url).request_cloud_catalog(
+        "synthetic_parquet", start, stop
+    )
+    sent = parquet_bucket.bytes_sent
+
+    async def request():
+        async with cloudcatalog.AsyncCloudCatalog(
+            parquet_bucket.url, cache_folder=str(tmp_path), cache=cache
+        ) as fr:
+            return await fr.request_cloud_catalog("synthetic_parquet", start, stop)
+
+    files = asyncio.run(request())
+    assert len(files) == 144
+    assert files.reset_index(drop=True).equals(expected.reset_index(drop=True))
+    if not cache:
+        # Only the footer and the overlapping row groups are downloaded
+        size = len(
+            parquet_bucket.files["/synthetic_parquet/synthetic_parquet_2019.parquet"]
+        )
+        assert parquet_bucket.bytes_sent - sent < size / 4
+
+
+def test_async_stream(bucket):
+    for row in range(10):
+        bucket.files[f"/data/{row}.cdf"] = bytes([row]) * 100
+    files = cloudcatalog.CloudCatalog(bucket.url).request_cloud_catalog(
+        "synthetic", "2019-01-01T00Z", "2019-01-01T01:40Z"
+    )
+    files["datakey"] = [f"{bucket.url}/data/{row}.cdf" for row in range(10)]
+
+    async def stream():
+        fr = await cloudcatalog.AsyncCloudCatalog.open(bucket.url, max_concurrency=3)
+        try:
+            return [item async for item in fr.stream(files)]
+        finally:
+            await fr.close()
+
+    streamed = asyncio.run(stream())
+    assert [fr_bytes_file.read()[:1] for fr_bytes_file, *_ in streamed] == [
+        bytes([row]) for row in range(10)
+    ]
+    assert streamed[0][1] == str(files["start"].iloc[0])
+
+    files.loc[files.index[3], "datakey"] = f"{bucket.url}/data/missing.cdf"
+    with pytest.raises(cloudcatalog.FailedS3Get):
+        asyncio.run(stream())
+
+
+def test_async_entire_catalog_search(bucket):
+    bucket.files["/registry.json"] = json.dumps(
+        {
+            "CloudCatalog": "1.0",
+            "registry": [
+                {"endpoint": bucket.url + "/", "name": "Stand-in", "region": "local"},
+                {"endpoint": bucket.url + "/gone/", "name": "Gone", "region": "local"},
+            ],
+        }
+    ).encode()
+    search = asyncio.run(
+        cloudcatalog.AsyncEntireCatalogSearch.open(bucket.url + "/registry.json")
+    )
+    assert len(search.combined_catalog) == 1
+    assert search.search_by_id("synth")[0]["id"] == "synthetic"
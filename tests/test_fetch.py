@@ -0,0 +1,282 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+import requests
+import cloudcatalog
+from cloudcatalog import (
+    AccessStrategyCache,
+    HTTPSessionPool,
+    RetryPolicy,
+    S3ClientRegistry,
+)
+
+
+@pytest.fixture
+def registry():
+    return S3ClientRegistry(max_pool_connections=4)
+
+
+def test_client_registry_reuses_clients(registry):
+    client = registry.get_client(unsigned=True, region="us-east-1")
+    assert registry.get_client(unsigned=True, region="us-east-1") is client
+    assert registry.get_client(unsigned=False, region="us-east-1") is not client
+    assert registry.get_client(unsigned=True, region="us-west-2") is not client
+    assert client.meta.config.max_pool_connections == 4
+    # Retries are left to RetryPolicy
+    assert client.meta.config.retries["total_max_attempts"] == 1
+
+
+def test_client_registry_pool_size(registry):
+    client = registry.get_client(unsigned=True, region="us-east-1")
+    registry.set_max_pool_connections(32)
+    new_client = registry.get_client(unsigned=True, region="us-east-1")
+    assert new_client is not client
+    assert new_client.meta.config.max_pool_connections == 32
+    # Clients of other sizes are kept for whoever still asks for them
+    sized = registry.get_client(
+        unsigned=True, region="us-east-1", max_pool_connections=4
+    )
+    assert sized is client
+
+
+def test_catalog_pool_size_is_per_instance(bucket, monkeypatch):
+    registry = S3ClientRegistry()
+    monkeypatch.setattr(cloudcatalog, "s3_client_registry", registry)
+    sent = []
+
+    def transport(method, s3url, **kwargs):
+        sent.append(kwargs)
+        return cloudcatalog.fetch_method(method, s3url, **kwargs)
+
+    monkeypatch.setattr(cloudcatalog, "retry_policy", RetryPolicy(transport=transport))
+    cloudcatalog.CloudCatalog(bucket.url, max_pool_connections=64)
+    # The size goes down with the catalog's fetches, the default is kept
+    assert sent[-1]["max_pool_connections"] == 64
+    assert registry.max_pool_connections == 10
+
+
+def test_client_registry_threadsafe(registry):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(
+            pool.map(lambda _: registry.get_client(region="us-east-1"), range(32))
+        )
+    assert all(client is clients[0] for client in clients)
+
+
+def test_access_strategy_order(tmp_path):
+    strategies = AccessStrategyCache(ttl=60)
+    assert strategies.order("bucket") == list(AccessStrategyCache.METHODS)
+    strategies.record("bucket", "unsigned", False)
+    strategies.record("bucket", "signed", False)
+    strategies.record("bucket", "https", True)
+    assert strategies.order("bucket") == ["https", "region"]
+
+    # Persisted records are picked up by a new cache
+    strategies.load(str(tmp_path / "access_strategy.json"))
+    strategies.save()
+    reloaded = AccessStrategyCache(ttl=60, path=str(tmp_path / "access_strategy.json"))
+    assert reloaded.order("bucket") == ["https", "region"]
+
+    # Expired records are probed again
+    reloaded.ttl = -1
+    assert reloaded.order("bucket") == list(AccessStrategyCache.METHODS)
+
+
+def test_atomic_write_cleans_up(tmp_path):
+    path = tmp_path / "index.csv"
+    cloudcatalog._atomic_write(str(path), b"start,stop\n")
+    assert path.read_bytes() == b"start,stop\n"
+
+    def fail(tmppath):
+        with open(tmppath, "w") as file:
+            file.write("partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        cloudcatalog._atomic_write(str(path), fail)
+    # The old content is intact and no temporary file is left behind
+    assert path.read_bytes() == b"start,stop\n"
+    assert [item.name for item in tmp_path.iterdir()] == ["index.csv"]
+
+
+def test_access_strategy_files_per_cache_folder(bucket, tmp_path, monkeypatch):
+    strategies = AccessStrategyCache()
+    monkeypatch.setattr(cloudcatalog, "access_strategy_cache", strategies)
+    first, second = tmp_path / "first", tmp_path / "second"
+    cloudcatalog.CloudCatalog(bucket.url, cache_folder=str(first), cache=True)
+    cloudcatalog.CloudCatalog(bucket.url, cache_folder=str(second), cache=True)
+    cloudcatalog.CloudCatalog(bucket.url, cache_folder=str(first), cache=True)
+    assert strategies.paths == [
+        str(first / "access_strategy.json"),
+        str(second / "access_strategy.json"),
+    ]
+    # Both cache folders are kept up to date, whichever catalog came last
+    strategies.record("elsewhere", "https", True)
+    for folder in (first, second):
+        assert "elsewhere" in json.loads((folder / "access_strategy.json").read_text())
+
+
+def test_fetch_S3orURL_skips_failed_methods(monkeypatch):
+    strategies = AccessStrategyCache()
+    monkeypatch.setattr(cloudcatalog, "access_strategy_cache", strategies)
+    calls = []
+
+    def fake_fetch_method(method, s3url, region=None, rawbytes=False, **kwargs):
+        calls.append(method)
+        if method != "https":
+            raise PermissionError("no S3 access")
+        return 200, b"start,stop,datakey,filesize\n"
+
+    monkeypatch.setattr(cloudcatalog, "fetch_method", fake_fetch_method)
+    assert cloudcatalog.fetch_S3orURL("s3://bucket/a.csv", rawbytes=True) is not None
+    assert calls == ["unsigned", "signed", "region", "https"]
+
+    calls.clear()
+    assert cloudcatalog.fetch_S3orURL("s3://bucket/b.csv", rawbytes=True) is not None
+    assert calls == ["https"]
+    assert strategies.stats() == {"fetches": 2, "attempts": 5, "skipped": 3}
+
+
+def test_http_session_pool_keepalive(standin):
+    standin.files["/a.csv"] = b"a"
+    standin.files["/b.csv"] = b"b"
+    pool = HTTPSessionPool(pool_maxsize=2, host_pool_sizes={"127.0.0.1": 1})
+    assert pool.get(standin.url + "/a.csv").content == b"a"
+    assert pool.get(standin.url + "/b.csv").content == b"b"
+    # Both requests came over the same kept-alive connection
+    assert standin.requests[0][2] == standin.requests[1][2]
+    assert "gzip" in standin.requests[0][1]["Accept-Encoding"]
+
+    session = pool.get_session()
+    pool.configure(compress=False)
+    pool.get(standin.url + "/a.csv")
+    assert standin.requests[2][1]["Accept-Encoding"] == "identity"
+    # The replaced session was closed, not leaked
+    assert all(not adapter.poolmanager.pools for adapter in session.adapters.values())
+    pool.close()
+
+
+def test_catalog_http_options_are_per_instance(bucket, monkeypatch):
+    pool = HTTPSessionPool()
+    monkeypatch.setattr(cloudcatalog, "http_session_pool", pool)
+    catalog = cloudcatalog.CloudCatalog(bucket.url, http_options={"compress": False})
+    catalog.request_cloud_catalog("synthetic", "2019-01-01T00Z", "2019-01-02T00Z")
+    assert bucket.requests[-1][1]["Accept-Encoding"] == "identity"
+    # The shared pool is untouched, other catalogs still ask for gzip
+    assert pool.compress and pool._session is None
+    assert pool.variant(compress=False) is catalog.fetch_options["session_pool"]
+    cloudcatalog.CloudCatalog(bucket.url)
+    assert "gzip" in bucket.requests[-1][1]["Accept-Encoding"]
+    pool.close()
+
+
+def test_fetch_S3orURL_rawbytes_and_streaming(standin):
+    standin.files["/data.fits"] = b"SIMPLE  =" + bytes(4096)
+    url = standin.url + "/data.fits"
+    fr_bytes_file = cloudcatalog.fetch_S3orURL(url, rawbytes=True)
+    assert fr_bytes_file.read() == standin.files["/data.fits"]
+
+    body = cloudcatalog.fetch_S3orURL(url, streaming=True)
+    assert not isinstance(body, BytesIO)
+    assert body.read(9) == b"SIMPLE  ="
+    assert len(body.read()) == 4096
+    body.close()
+
+
+class FakeTransport:
+    """Stands in for fetch_method, answering from a list of outcomes."""
+
+    def __init__(self, outcomes, delays=()):
+        self.outcomes = list(outcomes)
+        self.delays = list(delays)
+        self.calls = 0
+
+    def __call__(self, method, s3url, info=None, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if self.delays:
+            time.sleep(self.delays.pop(0))
+        if isinstance(outcome, Exception):
+            raise outcome
+        if info is not None:
+            info["etag"] = str(self.calls)
+        return outcome
+
+
+def test_retry_policy_backs_off_on_transient_errors():
+    waits = []
+    transport = FakeTransport(
+        [requests.ConnectionError("reset"), (503, None), (200, b"data")]
+    )
+    policy = RetryPolicy(
+        max_attempts=3, backoff=1, transport=transport, sleep=waits.append
+    )
+    assert policy.call("https", "https://example.org/a.csv") == (200, b"data")
+    assert transport.calls == 3
+    # Full jitter stays within the doubling backoff
+    assert 0 <= waits[0] <= 1 and 0 <= waits[1] <= 2
+    assert policy.stats()["retries"] == 2
+
+
+def test_retry_policy_gives_up():
+    transport = FakeTransport([PermissionError("denied")])
+    policy = RetryPolicy(transport=transport, sleep=lambda _: None)
+    with pytest.raises(PermissionError):
+        policy.call("unsigned", "s3://bucket/a.csv")
+    assert transport.calls == 1
+
+    transport = FakeTransport([requests.Timeout("slow")] * 2)
+    policy = RetryPolicy(max_attempts=2, transport=transport, sleep=lambda _: None)
+    with pytest.raises(requests.Timeout):
+        policy.call("https", "https://example.org/a.csv")
+    assert transport.calls == 2
+
+
+def test_retry_policy_hedges_slow_requests():
+    transport = FakeTransport([(200, b"fast")] * 20, delays=[0.01] * 20)
+    policy = RetryPolicy(hedge=True, hedge_min_samples=20, transport=transport)
+    for _ in range(20):
+        policy.call("https", "https://example.org/a.csv")
+    assert policy.stats()["hedges"] == 0
+    assert policy.hedge_delay("https://example.org") == pytest.approx(0.01, abs=0.05)
+
+    # The first request stalls, so the duplicate fired after p95 wins
+    transport.outcomes = [(200, b"stalled"), (200, b"hedged")]
+    transport.delays = [1.0, 0.0]
+    info = {}
+    assert policy.call("https", "https://example.org/a.csv", info=info) == (
+        200,
+        b"hedged",
+    )
+    assert info["etag"] == "22"
+    stats = policy.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+
+def test_fetch_S3orURL_retries(monkeypatch):
+    transport = FakeTransport([(500, None), (200, b"data")])
+    monkeypatch.setattr(
+        cloudcatalog,
+        "retry_policy",
+        RetryPolicy(transport=transport, sleep=lambda _: None),
+    )
+    fr_bytes_file = cloudcatalog.fetch_S3orURL(
+        "https://example.org/a.csv", rawbytes=True
+    )
+    assert fr_bytes_file.read() == b"data"
+
+
+def test_catalog_retry_options_are_per_instance(bucket, monkeypatch):
+    policy = RetryPolicy()
+    monkeypatch.setattr(cloudcatalog, "retry_policy", policy)
+    catalog = cloudcatalog.CloudCatalog(bucket.url, retry_options={"max_attempts": 5})
+    own = catalog.fetch_options["policy"]
+    assert own.max_attempts == 5 and policy.max_attempts == 3
+    assert policy.variant(max_attempts=5) is own
+    catalog.request_cloud_catalog("synthetic", "2019-01-01T00Z", "2019-01-02T00Z")
+    # The catalog's fetches go through its own policy only
+    assert own.stats()["requests"] == 2
+    assert policy.stats()["requests"] == 0
@@ -0,0 +1,564 @@
+import os
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+import cloudcatalog
+from cloudcatalog import CloudCatalog
+
+
+@pytest.fixture
+def catalog(bucket):
+    return CloudCatalog(bucket.url)
+
+
+def test_request_cloud_catalog(catalog):
+    files = catalog.request_cloud_catalog(
+        "synthetic", "2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"
+    )
+    assert len(files) == 144
+    assert list(files.columns) == ["start", "stop", "datakey", "filesize"]
+    assert files["start"].is_monotonic_increasing
+
+
+@pytest.mark.parametrize(
+    "start, stop",
+    [
+        ("2019-02-01T00:00:00Z", "2019-02-01T01:00:00Z"),
+        ("2019-02-01T00:05:00Z", "2019-02-01T00:25Z"),
+        ("2019-01-01T00Z", "2019-01-01T00:30Z"),
+        ("2019-05-19T00:00:00Z", "2020-01-01T01:00:00Z"),
+        ("2018-06-01T00Z", "2019-01-01T00:10Z"),
+    ],
+)
+def test_range_read_matches_full_read(bucket, catalog, start, stop):
+    full = catalog.request_cloud_catalog("synthetic", start, stop)
+    full_bytes = bucket.bytes_sent
+    sliced = catalog.request_cloud_catalog("synthetic", start, stop, range_read=True)
+    assert sliced.reset_index(drop=True).equals(full.reset_index(drop=True))
+    assert bucket.bytes_sent - full_bytes < full_bytes / 4
+
+
+def test_range_read_without_range_support(bucket, catalog):
+    bucket.ranges = False
+    start, stop = "2019-02-01T00:00:00Z", "2019-02-01T01:00:00Z"
+    sliced = catalog.request_cloud_catalog("synthetic", start, stop, range_read=True)
+    assert len(sliced) == 6
+
+
+def test_range_file(bucket):
+    url = bucket.url + "/synthetic/synthetic_2019.csv"
+    data = bucket.files["/synthetic/synthetic_2019.csv"]
+    rangefile = cloudcatalog.RangeFile(url, block_size=1024)
+    assert rangefile.supports_ranges and rangefile.size == len(data)
+    rangefile.seek(5000)
+    assert rangefile.read(3000) == data[5000:8000]
+    assert rangefile.pread(len(data) - 10, 100) == data[-10:]
+
+
+def test_revalidate_cached_index(bucket, tmp_path):
+    catalog = CloudCatalog(bucket.url, cache_folder=str(tmp_path), cache=True)
+    start, stop = "2019-12-31T00:00:00Z", "2020-01-02T00:00:00Z"
+    first = catalog.request_cloud_catalog("synthetic", start, stop)
+    sent = bucket.bytes_sent
+
+    # Unchanged indices are confirmed with 304s and read from the cache
+    again = catalog.request_cloud_catalog("synthetic", start, stop, revalidate=True)
+    assert again.equals(first)
+    assert bucket.bytes_sent == sent
+    assert "If-None-Match" in bucket.requests[-1][1]
+
+    # A changed index is downloaded again
+    index = bucket.files["/synthetic/synthetic_2020.csv"]
+    bucket.files["/synthetic/synthetic_2020.csv"] = b"\n".join(index.split(b"\n")[:11])
+    changed = catalog.request_cloud_catalog("synthetic", start, stop, revalidate=True)
+    assert len(first) == 144 and len(changed) == 10
+
+
+def test_entry_modification_invalidates_cache(bucket, tmp_path):
+    start, stop = "2019-12-31T00:00:00Z", "2020-01-02T00:00:00Z"
+    catalog = CloudCatalog(bucket.url, cache_folder=str(tmp_path), cache=True)
+    first = catalog.request_cloud_catalog("synthetic", start, stop)
+
+    # An unchanged entry trusts the cache without asking the server
+    requests = len(bucket.requests)
+    catalog = CloudCatalog(bucket.url, cache_folder=str(tmp_path), cache=True)
+    assert catalog.request_cloud_catalog("synthetic", start, stop).equals(first)
+    assert len(bucket.requests) == requests + 1  # catalog.json
+
+    # A new modification time makes cached indices be checked again
+    index = bucket.files["/synthetic/synthetic_2020.csv"]
+    bucket.files["/synthetic/synthetic_2020.csv"] = b"\n".join(index.split(b"\n")[:11])
+    bucket.files["/catalog.json"] = bucket.files["/catalog.json"].replace(
+        b"2022-01-01T00:00Z", b"2022-06-01T00:00Z"
+    )
+    catalog = CloudCatalog(bucket.url, cache_folder=str(tmp_path), cache=True)
+    sent = bucket.bytes_sent
+    changed = catalog.request_cloud_catalog("synthetic", start, stop)
+    assert len(first) == 144 and len(changed) == 10
+    checks = [
+        headers for _, headers, _ in bucket.requests if "If-None-Match" in headers
+    ]
+    assert len(checks) == 2
+    # Only the changed year was downloaded
+    assert bucket.bytes_sent - sent < len(index) / 100
+
+    # Without a modification time, cached indices expire after cache_ttl
+    bucket.files["/catalog.json"] = bucket.files["/catalog.json"].replace(
+        b'"modification": "2022-06-01T00:00Z", ', b""
+    )
+    catalog = CloudCatalog(
+        bucket.url, cache_folder=str(tmp_path), cache=True, cache_ttl=0
+    )
+    assert catalog.request_cloud_catalog("synthetic", start, stop).equals(changed)
+    checks = [
+        headers for _, headers, _ in bucket.requests if "If-None-Match" in headers
+    ]
+    assert len(checks) == 4
+
+
+@pytest.mark.parametrize("cache_format", ["csv", "feather"])
+def test_stale_cache_used_when_unreachable(bucket, tmp_path, cache_format):
+    start, stop = "2019-12-31T00:00:00Z", "2020-01-02T00:00:00Z"
+    options = dict(cache_folder=str(tmp_path), cache=True, cache_format=cache_format)
+    catalog = CloudCatalog(bucket.url, **options)
+    first = catalog.request_cloud_catalog("synthetic", start, stop)
+
+    # Expired years whose index host is down are kept, not dropped
+    bucket.files["/catalog.json"] = (
+        bucket.files["/catalog.json"]
+        .replace(b'"modification": "2022-01-01T00:00Z", ', b"")
+        .replace(bucket.url.encode() + b"/synthetic/", b"http://127.0.0.1:1/synthetic/")
+    )
+    catalog = CloudCatalog(bucket.url, cache_ttl=0, **options)
+    stale = catalog.request_cloud_catalog("synthetic", start, stop)
+    assert len(stale) == 144
+    assert stale.equals(first)
+
+
+def test_missing_years_remembered(bucket, tmp_path):
+    start, stop = "2020-05-18T00:00:00Z", "2021-01-02T00:00:00Z"
+    missing = "/synthetic/synthetic_2021.csv"
+    catalog = CloudCatalog(bucket.url, cache_folder=str(tmp_path), cache=True)
+    files = catalog.request_cloud_catalog("synthetic", start, stop)
+    assert len(files) == 128
+    assert [path for path, _, _ in bucket.requests].count(missing) == 1
+    assert (tmp_path / "synthetic" / "synthetic_2021.csv.missing").exists()
+
+    # Neither this process nor another sharing the cache folder asks again
+    assert catalog.request_cloud_catalog("synthetic", start, stop).equals(files)
+    cloudcatalog.missing_index_cache.clear()
+    catalog = CloudCatalog(bucket.url, cache_folder=str(tmp_path), cache=True)
+    assert catalog.request_cloud_catalog("synthetic", start, stop).equals(files)
+    assert [path for path, _, _ in bucket.requests].count(missing) == 1
+    assert cloudcatalog.missing_index_cache.stats()["hits"] == 1
+
+    # Once the TTL is over, the year is looked for again
+    bucket.files[missing] = (
+        b"# start,stop,datakey,filesize\n"
+        b"2021-01-01T00:00:00Z,2021-01-01T00:09:59Z,s3://bucket/new.cdf,10\n"
+    )
+    cloudcatalog.missing_index_cache.configure(ttl=0)
+    files = catalog.request_cloud_catalog("synthetic", start, stop)
+    assert len(files) == 129
+    assert not (tmp_path / "synthetic" / "synthetic_2021.csv.missing").exists()
+
+
+def test_missing_years_remembered_range_read(bucket, catalog):
+    start, stop = "2020-05-18T00:00:00Z", "2021-01-02T00:00:00Z"
+    missing = "/synthetic/synthetic_2021.csv"
+    files = catalog.request_cloud_catalog("synthetic", start, stop, range_read=True)
+    again = catalog.request_cloud_catalog("synthetic", start, stop, range_read=True)
+    assert len(files) == 128 and again.equals(files)
+    assert [path for path, _, _ in bucket.requests].count(missing) == 1
+    assert cloudcatalog.missing_index_cache.stats()["hits"] == 1
+
+
+def test_request_cloud_catalogs(wide_bucket):
+    catalog = CloudCatalog(wide_bucket.url)
+    queries = [
+        ("synthetic", "2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"),
+        ("synthetic_wide", "2019-03-01T00:00:00Z", "2019-03-01T12:00:00Z"),
+        # Overlaps the first window, its rows are only returned once
+        ("synthetic", "2019-02-01T12:00:00Z", "2019-02-03T00:00:00Z"),
+        ("synthetic", "2020-01-01T00:00:00Z", "2020-01-01T01:00:00Z"),
+    ]
+    results = catalog.request_cloud_catalogs(queries, max_workers=4)
+    # Each year index was fetched once for the whole batch
+    paths = [path for path, _, _ in wide_bucket.requests]
+    assert paths.count("/synthetic/synthetic_2019.csv") == 1
+    assert paths.count("/synthetic/synthetic_2020.csv") == 1
+    assert list(results) == ["synthetic", "synthetic_wide"]
+    expected = pd.concat(
+        [
+            catalog.request_cloud_catalog("synthetic", *queries[0][1:]),
+            catalog.request_cloud_catalog("synthetic", *queries[2][1:]),
+        ]
+    ).drop_duplicates()
+    assert len(results["synthetic"]) == 288 + 6
+    assert results["synthetic"][:288].equals(expected)
+    assert len(results["synthetic_wide"]) == 72
+    assert "quality" in results["synthetic_wide"].columns
+
+    long = catalog.request_cloud_catalogs(
+        queries=queries, concat=True, columns=["datakey"]
+    )
+    assert list(long.columns) == ["id", "datakey"]
+    assert long["id"].value_counts().to_dict() == {
+        "synthetic": 294,
+        "synthetic_wide": 72,
+    }
+
+
+def test_parallel_years_keep_order(bucket, catalog, tmp_path):
+    start, stop = "2019-01-01T00:00:00Z", "2021-12-31T00:00:00Z"
+    serial = catalog.request_cloud_catalog("synthetic", start, stop)
+    parallel = catalog.request_cloud_catalog("synthetic", start, stop, max_workers=3)
+    assert parallel.equals(serial)
+    assert parallel["start"].is_monotonic_increasing
+
+    cached = CloudCatalog(bucket.url, cache_folder=str(tmp_path), cache=True)
+    first = cached.request_cloud_catalog("synthetic", start, stop, max_workers=3)
+    again = cached.request_cloud_catalog("synthetic", start, stop, max_workers=3)
+    assert first.equals(serial) and again.equals(serial)
+    assert sorted(p.name for p in (tmp_path / "synthetic").glob("*.csv")) == [
+        "synthetic_2019.csv",
+        "synthetic_2020.csv",
+    ]
+
+
+@pytest.mark.parametrize(
+    "start, stop",
+    [
+        ("2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"),
+        ("2019-05-19T00:00:00Z", "2020-01-01T01:00:00Z"),
+    ],
+)
+def test_parquet_index_matches_csv(parquet_bucket, start, stop):
+    catalog = CloudCatalog(parquet_bucket.url)
+    expected = catalog.request_cloud_catalog("synthetic", start, stop)
+    sent = parquet_bucket.bytes_sent
+    files = catalog.request_cloud_catalog("synthetic_parquet", start, stop)
+    assert files["datakey"].tolist() == expected["datakey"].tolist()
+    assert (files["start"].values == expected["start"].values).all()
+    assert list(files.columns) == ["start", "stop", "datakey", "filesize"]
+
+    # Only the footers and the overlapping row groups are downloaded
+    parquet_sizes = sum(
+        len(data)
+        for path, data in parquet_bucket.files.items()
+        if path.endswith(".parquet")
+    )
+    assert parquet_bucket.bytes_sent - sent < parquet_sizes / 4
+
+    projected = catalog.request_cloud_catalog(
+        "synthetic_parquet", start, stop, columns=["start", "datakey"]
+    )
+    assert list(projected.columns) == ["start", "datakey"]
+    assert projected["datakey"].tolist() == expected["datakey"].tolist()
+
+
+def test_parquet_index_cached(parquet_bucket, tmp_path):
+    catalog = CloudCatalog(parquet_bucket.url, cache_folder=str(tmp_path), cache=True)
+    start, stop = "2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"
+    files = catalog.request_cloud_catalog("synthetic_parquet", start, stop)
+    again = catalog.request_cloud_catalog("synthetic_parquet", start, stop)
+    assert len(files) == 144 and again.equals(files)
+    assert (tmp_path / "synthetic_parquet" / "synthetic_parquet_2019.parquet").exists()
+
+
+def test_csv_zip_index(zip_bucket, tmp_path):
+    catalog = CloudCatalog(zip_bucket.url, cache_folder=str(tmp_path), cache=True)
+    start, stop = "2019-05-01T00:00:00Z", "2020-01-02T00:00:00Z"
+    expected = catalog.request_cloud_catalog("synthetic", start, stop)
+    sent = zip_bucket.bytes_sent
+    files = catalog.request_cloud_catalog("synthetic_zip", start, stop, range_read=True)
+    assert files.equals(expected)
+    assert zip_bucket.bytes_sent - sent < sent / 3
+
+    # The compressed index is cached as is
+    cached = tmp_path / "synthetic_zip" / "synthetic_zip_2019.csv.zip"
+    assert zipfile.is_zipfile(cached)
+    assert catalog.request_cloud_catalog("synthetic_zip", start, stop).equals(expected)
+
+
+def test_parse_iso8601_mixed_precision(caplog):
+    values = pd.Series(
+        [
+            "2019-01-01T00:00Z",
+            "2019-01-01T00:00:05Z",
+            "2019-01-01T00:00:05.250Z",
+            "2019-01-01T01",
+            "2019-01-02",
+            None,
+        ]
+    )
+    parsed = cloudcatalog.parse_iso8601(values)
+    assert parsed.dtype == "datetime64[ns]"
+    assert list(pd.Series(parsed)) == [
+        pd.Timestamp("2019-01-01T00:00"),
+        pd.Timestamp("2019-01-01T00:00:05"),
+        pd.Timestamp("2019-01-01T00:00:05.250"),
+        pd.Timestamp("2019-01-01T01:00"),
+        pd.Timestamp("2019-01-02"),
+        pd.NaT,
+    ]
+
+    # Bad rows are reported, and either raise or become NaT
+    values[1] = "2019-13-01T00:00Z"
+    with pytest.raises(ValueError, match="rows 1: '2019-13-01T00:00Z'"):
+        cloudcatalog.parse_iso8601(values, errors="raise")
+    parsed = cloudcatalog.parse_iso8601(values)
+    assert pd.isna(parsed[1]) and parsed[0] == pd.Timestamp("2019-01-01")
+    assert "Cannot parse 1 timestamps" in caplog.text
+
+
+def test_columns_and_dtypes(wide_bucket):
+    catalog = CloudCatalog(wide_bucket.url)
+    start, stop = "2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"
+    files = catalog.request_cloud_catalog("synthetic_wide", start, stop)
+    assert list(files.columns) == [
+        "start",
+        "stop",
+        "datakey",
+        "filesize",
+        "quality",
+        "rsun",
+    ]
+    assert files["filesize"].dtype == "int64"
+    assert files["start"].dtype == "datetime64[ns]"
+
+    projected = catalog.request_cloud_catalog(
+        "synthetic_wide",
+        start,
+        stop,
+        columns=["datakey", "quality"],
+        dtypes={"quality": "int8"},
+    )
+    assert list(projected.columns) == ["datakey", "quality"]
+    assert projected["quality"].dtype == "int8"
+    assert projected["datakey"].tolist() == files["datakey"].tolist()
+
+
+def test_filesize_with_gaps(bucket):
+    index = bucket.files["/synthetic/synthetic_2019.csv"].split(b"\n")
+    index[1] = index[1].rsplit(b",", 1)[0] + b","
+    bucket.files["/synthetic/synthetic_2019.csv"] = b"\n".join(index)
+    files = CloudCatalog(bucket.url).request_cloud_catalog(
+        "synthetic", "2019-01-01T00:00:00Z", "2019-01-01T01:00:00Z"
+    )
+    assert files["filesize"].isna().tolist() == [True] + [False] * 5
+
+
+@pytest.mark.parametrize("chunksize, max_workers", [(None, None), (1000, 2)])
+def test_iter_cloud_catalog(catalog, chunksize, max_workers):
+    start, stop = "2019-05-01T00:00:00Z", "2020-02-01T00:00:00Z"
+    expected = catalog.request_cloud_catalog("synthetic", start, stop)
+    frames = list(
+        catalog.iter_cloud_catalog(
+            "synthetic", start, stop, chunksize=chunksize, max_workers=max_workers
+        )
+    )
+    if chunksize is None:
+        assert len(frames) == 2
+    else:
+        assert all(len(fr) <= chunksize for fr in frames) and len(frames) > 2
+    assert pd.concat(frames).equals(expected)
+
+
+def test_no_matches(catalog):
+    start, stop = "2021-06-01T00:00:00Z", "2021-07-01T00:00:00Z"
+    files = catalog.request_cloud_catalog("synthetic", start, stop)
+    assert len(files) == 0
+    assert list(files.columns) == ["start", "stop", "datakey", "filesize"]
+    assert list(catalog.iter_cloud_catalog("synthetic", start, stop)) == []
+
+
+def test_frame_cache(bucket, catalog, monkeypatch):
+    frame_cache = cloudcatalog.FrameCache(256 * 1024**2)
+    monkeypatch.setattr(cloudcatalog, "frame_cache", frame_cache)
+    first = catalog.request_cloud_catalog(
+        "synthetic", "2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"
+    )
+    requests = len(bucket.requests)
+    assert frame_cache.stats()["misses"] == 1
+
+    # A sliding window over the same year is served from memory
+    second = catalog.request_cloud_catalog(
+        "synthetic", "2019-02-01T12:00:00Z", "2019-02-02T12:00:00Z"
+    )
+    assert len(bucket.requests) == requests
+    assert frame_cache.stats()["hits"] == 1
+    assert second["start"].iloc[0] == first["start"].iloc[72]
+
+    # Entries are evicted once over budget
+    size = frame_cache.stats()["bytes"]
+    frame_cache.configure(max_bytes=size + size // 2)
+    catalog.request_cloud_catalog(
+        "synthetic", "2020-02-01T00:00:00Z", "2020-02-02T00:00:00Z"
+    )
+    stats = frame_cache.stats()
+    assert stats["entries"] == 1 and stats["evictions"] == 1
+
+    # Entries expire after cache_ttl, like the cache folder's
+    expiring = CloudCatalog(bucket.url, cache_ttl=0)
+    requests = len(bucket.requests)
+    expiring.request_cloud_catalog(
+        "synthetic", "2020-02-01T00:00:00Z", "2020-02-02T00:00:00Z"
+    )
+    assert len(bucket.requests) == requests + 1
+    assert frame_cache.stats()["misses"] == 3
+
+
+def test_feather_cache(bucket, tmp_path):
+    pytest.importorskip("pyarrow")
+    catalog = CloudCatalog(
+        bucket.url, cache_folder=str(tmp_path), cache=True, cache_format="feather"
+    )
+    start, stop = "2019-02-01T00:00:00Z", "2019-02-02T00:00:00Z"
+    first = catalog.request_cloud_catalog("synthetic", start, stop)
+    typed_path = tmp_path / "synthetic" / "synthetic_2019.csv.feather"
+    assert typed_path.exists()
+
+    # Warm requests read the typed copy, never the csv
+    (tmp_path / "synthetic" / "synthetic_2019.csv").write_bytes(b"start,stop\n")
+    os.utime(typed_path)
+    warm = catalog.request_cloud_catalog("synthetic", start, stop)
+    assert warm.equals(first)
+    assert warm["start"].dtype == "datetime64[ns]"
+    projected = catalog.request_cloud_catalog(
+        "synthetic", start, stop, columns=["datakey"], dtypes={"filesize": "int32"}
+    )
+    assert projected["datakey"].tolist() == first["datakey"].tolist()
+
+    # A newer csv (e.g. after overwrite) makes the typed copy stale
+    fresh = catalog.request_cloud_catalog("synthetic", start, stop, overwrite=True)
+    assert fresh.equals(first)
+    assert os.path.getmtime(typed_path) >= os.path.getmtime(
+        tmp_path / "synthetic" / "synthetic_2019.csv"
+    )
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_filter_windows_matches_mask(ordered):
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2019-01-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, 365 * 86400, 5000)), unit="s"
+    )
+    # Mostly short files, a few longer than the look-back
+    duration = pd.to_timedelta(rng.choice([600, 3600, 5 * 86400], 5000), unit="s")
+    fr = pd.DataFrame({"start": start, "stop": start + duration, "datakey": "x"})
+    fr.loc[100, "stop"] = pd.NaT
+    if not ordered:
+        fr = fr.sample(frac=1, random_state=0)
+    windows = [
+        (datetime(2019, 3, 1), datetime(2019, 3, 2)),
+        (datetime(2019, 3, 1, 12), datetime(2019, 3, 5)),
+        (datetime(2019, 7, 1, 6), datetime(2019, 7, 1, 7)),
+        (datetime(2018, 1, 1), datetime(2018, 2, 1)),
+        (datetime(2019, 12, 31), datetime(2020, 1, 1)),
+    ]
+    for count in (1, 2, len(windows)):
+        expected = np.zeros(len(fr), dtype=bool)
+        for start_date, stop_date in windows[:count]:
+            expected |= (fr["stop"] >= start_date) & (fr["start"] < stop_date)
+        filtered = CloudCatalog._filter_windows(fr, windows[:count])
+        assert filtered.equals(fr[expected])
+    for start_date, stop_date in windows:
+        filtered = CloudCatalog._filter_dates(fr, start_date, stop_date)
+        expected = fr[(fr["stop"] >= start_date) & (fr["start"] < stop_date)]
+        assert filtered.equals(expected)
+
+
+def test_compact_datakeys(bucket, catalog):
+    start, stop = "2019-05-19T00:00:00Z", "2020-01-02T00:00:00Z"
+    files = catalog.request_cloud_catalog("synthetic", start, stop)
+    compact = catalog.request_cloud_catalog("synthetic", start, stop, compact=True)
+    assert list(compact.columns) == [
+        "start",
+        "stop",
+        "datakey_prefix",
+        "datakey_suffix",
+        "filesize",
+    ]
+    assert list(compact["datakey_prefix"].cat.categories) == [
+        "s3://gov-nasa-hdrl-data1/mission/2019/",
+        "s3://gov-nasa-hdrl-data1/mission/2020/",
+    ]
+    assert cloudcatalog.expand_datakeys(compact).equals(files)
+    assert cloudcatalog.compact_datakeys(files[["start"]]).equals(files[["start"]])
+
+    # stream and stream_uri see the full keys
+    streamed = []
+    CloudCatalog.stream_uri(compact, lambda *row: streamed.append(row))
+    assert [row[0] for row in streamed] == files["datakey"].tolist()
+    assert streamed[0][1:] == (
+        str(files["start"].iloc[0]),
+        str(files["stop"].iloc[0]),
+        files["filesize"].iloc[0],
+    )
+
+    for row in range(3):
+        bucket.files[f"/data/{row}.cdf"] = bytes([row]) * 100
+    compact = cloudcatalog.compact_datakeys(files.iloc[:3].copy())
+    compact["datakey_suffix"] = [f"{row}.cdf" for row in range(3)]
+    compact["datakey_prefix"] = pd.Categorical([f"{bucket.url}/data/"] * 3)
+    streamed = []
+    CloudCatalog.stream(compact, lambda bfile, *_: streamed.append(bfile.read()))
+    assert streamed == [bytes([row]) * 100 for row in range(3)]
+
+
+@pytest.mark.parametrize("backend", ["arrow", "polars", "numpy"])
+def test_result_backends(catalog, backend):
+    if backend != "numpy":
+        pytest.importorskip("pyarrow")
+    if backend == "polars":
+        pytest.importorskip("polars")
+    start, stop = "2019-05-19T00:00:00Z", "2020-01-02T00:00:00Z"
+    expected = catalog.request_cloud_catalog("synthetic", start, stop)
+    result = catalog.request_cloud_catalog("synthetic", start, stop, backend=backend)
+    if backend == "arrow":
+        assert result.column_names == list(expected.columns)
+        assert result.column("datakey").to_pylist() == expected["datakey"].tolist()
+    elif backend == "polars":
+        assert result.columns == list(expected.columns)
+        assert result["filesize"].to_list() == expected["filesize"].tolist()
+    else:
+        assert result.dtype.names == tuple(expected.columns)
+        assert result["datakey"].tolist() == expected["datakey"].tolist()
+        # Strings are references, not fields as wide as the longest one
+        assert result.dtype["datakey"] == object
+        assert result.itemsize <= 8 * len(expected.columns)
+        assert (result["start"] == expected["start"].to_numpy()).all()
+    assert len(result) == len(expected)
+
+    chunks = list(catalog.iter_cloud_catalog("synthetic", start, stop, backend=backend))
+    assert sum(len(chunk) for chunk in chunks) == len(expected)
+    with pytest.raises(ValueError):
+        catalog.request_cloud_catalog("synthetic", start, stop, backend="excel")
+
+
+def test_pyarrow_engine_matches_pandas(wide_bucket, zip_bucket):
+    pytest.importorskip("pyarrow")
+    index = wide_bucket.files["/synthetic/synthetic_2019.csv"].split(b"\n")
+    index[1] = index[1].rsplit(b",", 1)[0] + b","
+    index[2] = index[2].replace(b":00Z,", b":00.250Z,", 1)
+    wide_bucket.files["/synthetic/synthetic_2019.csv"] = b"\n".join(index)
+    window = {"start_date": "2019-01-01T00:00:00Z", "stop_date": "2020-01-02T00:00:00Z"}
+    requests = [
+        ("synthetic", {}),
+        ("synthetic_zip", {}),
+        ("synthetic_wide", {}),
+        ("synthetic_wide", {"columns": ["datakey", "quality"]}),
+        ("synthetic_wide", {"dtypes": {"quality": "category", "filesize": "int32"}}),
+    ]
+    pandas_engine = CloudCatalog(wide_bucket.url)
+    pyarrow_engine = CloudCatalog(wide_bucket.url, engine="pyarrow")
+    for catalog_id, options in requests:
+        expected = pandas_engine.request_cloud_catalog(catalog_id, **window, **options)
+        files = pyarrow_engine.request_cloud_catalog(catalog_id, **window, **options)
+        pd.testing.assert_frame_equal(files, expected)
+    with pytest.raises(ValueError):
+        CloudCatalog(wide_bucket.url, engine="polars")
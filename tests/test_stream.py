@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+
+import pandas as pd
+import pytest
+import cloudcatalog
+from cloudcatalog import CloudCatalog
+
+
+@pytest.fixture
+def files(standin):
+    """A catalog of 8 data files on the stand-in, 1 byte each."""
+    for row in range(8):
+        standin.files[f"/data/{row}.cdf"] = bytes([row])
+    start = pd.date_range("2019-01-01", periods=8, freq="10min")
+    return pd.DataFrame(
+        {
+            "start": start,
+            "stop": start + pd.Timedelta(minutes=10),
+            "datakey": [f"{standin.url}/data/{row}.cdf" for row in range(8)],
+            "filesize": [1] * 8,
+        }
+    )
+
+
+def collect(files, **options):
+    streamed, threads = [], set()
+
+    def process(fr_bytes_file, start, stop, filesize):
+        threads.add(threading.get_ident())
+        streamed.append(fr_bytes_file.read()[0])
+
+    CloudCatalog.stream(files, process, **options)
+    assert threads == {threading.get_ident()}
+    return streamed
+
+
+def test_stream_concurrent_ordered(standin, files):
+    for row in range(8):
+        standin.delays[f"/data/{row}.cdf"] = 0.2
+    assert collect(files) == list(range(8))
+    assert standin.peak_in_flight == 1
+
+    # Downloads overlap, files are still handed over in catalog order
+    standin.delays["/data/0.cdf"] = 0.5
+    assert collect(files, max_workers=8) == list(range(8))
+    assert standin.peak_in_flight > 1
+
+
+def test_stream_unordered(standin, files):
+    standin.delays["/data/0.cdf"] = 0.5
+    streamed = collect(files, max_workers=4, ordered=False)
+    assert sorted(streamed) == list(range(8))
+    assert streamed[0] != 0
+    assert streamed[-1] == 0
+
+
+@pytest.mark.parametrize("max_workers, ordered", [(None, True), (3, True), (3, False)])
+def test_stream_failures(standin, files, caplog, max_workers, ordered):
+    del standin.files["/data/2.cdf"]
+    with pytest.raises(cloudcatalog.FailedS3Get):
+        collect(files, max_workers=max_workers, ordered=ordered)
+
+    with caplog.at_level(logging.WARNING):
+        streamed = collect(
+            files, max_workers=max_workers, ordered=ordered, ignore_faileds3get=True
+        )
+    assert sorted(streamed) == [0, 1, 3, 4, 5, 6, 7]
+    assert "data/2.cdf" in caplog.text
+
+
+def test_stream_stops_on_process_error(standin, files):
+    for row in range(8):
+        standin.delays[f"/data/{row}.cdf"] = 0.1
+
+    def process(fr_bytes_file, start, stop, filesize):
+        raise RuntimeError("bad file")
+
+    with pytest.raises(RuntimeError):
+        CloudCatalog.stream(files, process, max_workers=2, streaming=True)
+    time.sleep(0.3)
+    # Only the downloads already under way were made
+    assert len(standin.requests) <= 4
+
+
+def test_stream_read_ahead(standin, files):
+    for row in range(8):
+        standin.delays[f"/data/{row}.cdf"] = 0.1
+    requested = []
+
+    def process(fr_bytes_file, start, stop, filesize):
+        before = len(standin.requests)
+        time.sleep(0.1)
+        requested.append((before, len(standin.requests)))
+
+    CloudCatalog.stream(files, process)
+    assert requested == [(row + 1, row + 1) for row in range(8)]
+
+    # Downloads overlap processing, one at a time, at most 2 ahead
+    requested.clear()
+    standin.requests.clear()
+    CloudCatalog.stream(files, process, read_ahead=2)
+    assert any(after > row + 1 for row, (_, after) in enumerate(requested))
+    assert all(before <= row + 3 for row, (before, _) in enumerate(requested))
+    assert requested[-1][0] == 8
+    assert standin.peak_in_flight == 1